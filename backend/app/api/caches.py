@@ -0,0 +1,31 @@
+"""Per-process response caches for the dashboard's polled views.
+
+Routers clear them on their own writes, including writes that change another
+router's view. Celery workers write from other processes and cannot reach
+them, so worker updates show up once an entry expires (within the TTL).
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from app.core.cache import TTLCache
+
+PROJECT_LIST_CACHE = TTLCache(ttl=2.0)
+PROJECT_DETAIL_CACHE = TTLCache(ttl=2.0, maxsize=1024)
+FAILED_COMMIT_LIST_CACHE = TTLCache(ttl=2.0)
+
+
+def wants_fresh(cache_control: Optional[str]) -> bool:
+    """Whether a request's Cache-Control header asks to bypass the cache."""
+    return "no-cache" in (cache_control or "")
+
+
+def invalidate_project(project_id: str) -> None:
+    """Drop a written project from the detail cache and the project list."""
+    PROJECT_DETAIL_CACHE.pop(project_id)
+    PROJECT_LIST_CACHE.clear()
+
+
+def invalidate_failed_commits() -> None:
+    FAILED_COMMIT_LIST_CACHE.clear()
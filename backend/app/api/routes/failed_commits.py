@@ -1,18 +1,31 @@
 from __future__ import annotations
 
-from typing import Optional
-import json
+from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.concurrency import run_in_threadpool
+import orjson
+from fastapi import APIRouter, HTTPException, Query, Request
 from pydantic import BaseModel, Field
 
-from app.models import FailedCommit, ScanJobStatus
-from app.services import repository
+from app.api.caches import (
+    FAILED_COMMIT_LIST_CACHE,
+    invalidate_failed_commits,
+    wants_fresh,
+)
+from app.core.concurrency import run_db_read, run_db_write
+from app.models import FailedCommit, PaginatedFailedCommits, ScanJobStatus
+from app.services import async_repository, repository
 from app.tasks.sonar import run_scan_job
 
 router = APIRouter()
 
+# Stored payloads carry the whole commit row; retries only need these paths.
+_RETRY_FIELDS = [
+    "payload.job_id",
+    "payload.project_id",
+    "config_override",
+    "config_source",
+]
+
 
 class FailedCommitUpdateRequest(BaseModel):
     config_override: str = Field(
@@ -26,33 +39,47 @@ class FailedCommitRetryRequest(BaseModel):
     config_source: Optional[str] = None
 
 
-@router.get("/")
+@router.get("/", response_model=PaginatedFailedCommits)
 async def list_failed_commits(
+    request: Request,
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=1000),
     sort_by: Optional[str] = Query(default=None),
     sort_dir: str = Query(default="desc"),
     filters: Optional[str] = Query(default=None),
+    after: Optional[str] = Query(default=None),
 ) -> dict:
 
-    parsed_filters = json.loads(filters) if filters else None
-    result = await run_in_threadpool(
+    # Dashboards poll this view; serve repeat queries from memory briefly.
+    cache_key = (page, page_size, sort_by, sort_dir, filters, after)
+    if not wants_fresh(request.headers.get("cache-control")):
+        cached = FAILED_COMMIT_LIST_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+    generation = FAILED_COMMIT_LIST_CACHE.generation()
+    parsed_filters = orjson.loads(filters) if filters else None
+    result = await run_db_read(
         repository.list_failed_commits_paginated,
         page,
         page_size,
         sort_by,
         sort_dir,
         parsed_filters,
+        after,
     )
-    return {
-        "items": [FailedCommit(**record) for record in result["items"]],
+    response = {
+        "items": result["items"],
         "total": result["total"],
+        "next_cursor": result["next_cursor"],
     }
+    FAILED_COMMIT_LIST_CACHE.set(cache_key, response, generation)
+    return response
 
 
 @router.get("/{record_id}", response_model=FailedCommit)
 async def get_failed_commit(record_id: str) -> FailedCommit:
-    record = await run_in_threadpool(repository.get_failed_commit, record_id)
+    record = await async_repository.get_failed_commit(record_id)
     if not record:
         raise HTTPException(status_code=404, detail="Failed commit not found")
     return FailedCommit(**record)
@@ -62,7 +89,7 @@ async def get_failed_commit(record_id: str) -> FailedCommit:
 async def update_failed_commit(
     record_id: str, payload: FailedCommitUpdateRequest
 ) -> FailedCommit:
-    updated = await run_in_threadpool(
+    updated = await run_db_write(
         repository.update_failed_commit,
         record_id,
         config_override=payload.config_override,
@@ -70,14 +97,15 @@ async def update_failed_commit(
     )
     if not updated:
         raise HTTPException(status_code=404, detail="Failed commit not found")
+    invalidate_failed_commits()
     return FailedCommit(**updated)
 
 
-@router.post("/{record_id}/retry", response_model=FailedCommit)
-async def retry_failed_commit(
+def _requeue_failed_commit(
     record_id: str, payload: FailedCommitRetryRequest
-) -> FailedCommit:
-    record = await run_in_threadpool(repository.get_failed_commit, record_id)
+) -> tuple[str, Optional[Dict[str, Any]]]:
+    """Reset the scan job and mark the record queued within one worker thread."""
+    record = repository.get_failed_commit(record_id, fields=_RETRY_FIELDS)
     if not record:
         raise HTTPException(status_code=404, detail="Failed commit not found")
 
@@ -94,8 +122,7 @@ async def retry_failed_commit(
     config_override = payload.config_override or record.get("config_override")
     config_source = payload.config_source or record.get("config_source") or "text"
 
-    await run_in_threadpool(
-        repository.update_scan_job,
+    repository.update_scan_job(
         job_id,
         config_override=config_override,
         config_source=config_source if config_override else None,
@@ -104,15 +131,22 @@ async def retry_failed_commit(
         retry_count_delta=1,
         retry_count=None,
     )
-
-    run_scan_job.delay(job_id)
-    updated = await run_in_threadpool(
-        repository.update_failed_commit,
+    updated = repository.update_failed_commit(
         record_id,
         config_override=config_override,
         config_source=config_source if config_override else record.get("config_source"),
         status="queued",
     )
+    return job_id, updated
+
+
+@router.post("/{record_id}/retry", response_model=FailedCommit)
+async def retry_failed_commit(
+    record_id: str, payload: FailedCommitRetryRequest
+) -> FailedCommit:
+    job_id, updated = await run_db_write(_requeue_failed_commit, record_id, payload)
+    run_scan_job.delay(job_id)
     if not updated:
         raise HTTPException(status_code=404, detail="Failed to update record")
+    invalidate_failed_commits()
     return FailedCommit(**updated)
@@ -2,23 +2,38 @@ from __future__ import annotations
 
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 import csv
 import io
-import json
+from itertools import islice
 
-from fastapi import APIRouter, File, Form, HTTPException, Query, UploadFile
+import orjson
+from celery import group
+from fastapi import APIRouter, File, Form, HTTPException, Query, Request, UploadFile
 from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 
-from app.models import Project, ProjectStatus, ScanJobStatus
+from app.api.caches import (
+    PROJECT_DETAIL_CACHE,
+    PROJECT_LIST_CACHE,
+    invalidate_failed_commits,
+    invalidate_project,
+    wants_fresh,
+)
+from app.core.concurrency import run_db_read, run_db_write
+from app.models import PaginatedProjects, Project, ProjectStatus, ScanJobStatus
 from pipeline.ingestion import CSVIngestionPipeline
-from app.services import file_service, repository
+from app.services import async_repository, file_service, repository
 from app.tasks.ingestion import ingest_project
 from app.tasks.sonar import run_scan_job
 
 router = APIRouter()
 
+# CSV export rows buffered per streamed chunk.
+_EXPORT_BATCH_ROWS = 256
+# The only scan result fields the CSV export reads.
+_EXPORT_FIELDS = ["sonar_project_key", "job_id", "created_at", "metrics"]
+
 
 def _build_sonar_config(
     upload: Optional[UploadFile],
@@ -39,36 +54,59 @@ def _build_sonar_config(
     }
 
 
-@router.get("/")
+@router.get("/", response_model=PaginatedProjects)
 async def list_projects(
+    request: Request,
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=1000),
     sort_by: Optional[str] = Query(default=None),
     sort_dir: str = Query(default="desc"),
     filters: Optional[str] = Query(default=None),
+    after: Optional[str] = Query(default=None),
 ) -> dict:
 
-    parsed_filters = json.loads(filters) if filters else None
-    result = await run_in_threadpool(
+    # Dashboards poll this view; serve repeat queries from memory briefly.
+    cache_key = (page, page_size, sort_by, sort_dir, filters, after)
+    if not wants_fresh(request.headers.get("cache-control")):
+        cached = PROJECT_LIST_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+    generation = PROJECT_LIST_CACHE.generation()
+    parsed_filters = orjson.loads(filters) if filters else None
+    result = await run_db_read(
         repository.list_projects_paginated,
         page,
         page_size,
         sort_by,
         sort_dir,
         parsed_filters,
+        after,
     )
-    return {
-        "items": [Project(**record) for record in result["items"]],
+    # response_model validates and serialises the raw page in a single pass.
+    response = {
+        "items": result["items"],
         "total": result["total"],
+        "next_cursor": result["next_cursor"],
     }
+    PROJECT_LIST_CACHE.set(cache_key, response, generation)
+    return response
 
 
 @router.get("/{project_id}", response_model=Project)
 async def get_project(project_id: str) -> Project:
-    record = await run_in_threadpool(repository.get_project, project_id)
+    # Progress views poll single projects; counters may lag by up to the TTL.
+    cached = PROJECT_DETAIL_CACHE.get(project_id)
+    if cached is not None:
+        return cached
+    # Taken before the read, so a write landing meanwhile is not re-cached stale.
+    generation = PROJECT_DETAIL_CACHE.generation()
+    record = await async_repository.get_project(project_id)
     if not record:
         raise HTTPException(status_code=404, detail="Project not found")
-    return Project(**record)
+    project = Project(**record)
+    PROJECT_DETAIL_CACHE.set(project_id, project, generation)
+    return project
 
 
 @router.post("/", response_model=Project)
@@ -87,14 +125,17 @@ async def upload_project(
     name = name_form or name_query
     if not name:
         raise HTTPException(status_code=400, detail="Project name is required.")
-    saved_path = await file_service.save_upload(file)
+    saved_path, digest = await file_service.save_upload_with_digest(file)
     pipeline = CSVIngestionPipeline(Path(saved_path))
-    stats = await run_in_threadpool(pipeline.summarise)
-    sonar_config = _build_sonar_config(
-        sonar_config_file, repo_key=stats.get("project_key") or name
+    stats = await run_in_threadpool(pipeline.summarise_cached, digest)
+    # The config file is written with blocking I/O; keep it off the event loop.
+    sonar_config = await run_in_threadpool(
+        _build_sonar_config,
+        sonar_config_file,
+        repo_key=stats.get("project_key") or name,
     )
     project_key = stats.get("project_key") or Path(saved_path).stem
-    created = await run_in_threadpool(
+    created = await run_db_write(
         repository.create_project,
         project_name=name,
         project_key=project_key,
@@ -104,12 +145,34 @@ async def upload_project(
         source_path=str(saved_path),
         sonar_config=sonar_config,
     )
+    invalidate_project(created["id"])
     return Project(**created)
 
 
+def _reset_failed_jobs(failed_jobs: List[dict]) -> None:
+    """Reset permanently failed jobs and their failed-commit records in bulk."""
+    job_ids = [job["id"] for job in failed_jobs]
+    now = datetime.utcnow()
+    repository.bulk_update_scan_jobs(
+        job_ids,
+        {
+            "status": ScanJobStatus.pending.value,
+            "last_error": None,
+            "retry_count": 0,
+            "last_worker_id": None,
+            "last_started_at": None,
+            "last_finished_at": None,
+        },
+        now=now,
+    )
+    repository.bulk_update_failed_commits_by_job(
+        job_ids, status="queued", counted=False, now=now
+    )
+
+
 @router.post("/{project_id}/collect")
 async def trigger_collection(project_id: str) -> dict:
-    record = await run_in_threadpool(repository.get_project, project_id)
+    record = await async_repository.get_project(project_id)
     if not record:
         raise HTTPException(status_code=404, detail="Project not found")
     status_value = record.get("status")
@@ -123,56 +186,39 @@ async def trigger_collection(project_id: str) -> dict:
 
     if project_status == ProjectStatus.pending:
         ingest_project.delay(project_id)
-        await run_in_threadpool(
+        await run_db_write(
             repository.update_project,
             project_id,
             status=ProjectStatus.processing.value,
             processed_commits=0,
             failed_commits=0,
         )
+        invalidate_project(project_id)
         return {"status": "queued"}
 
     if project_status == ProjectStatus.finished:
-        failed_jobs = await run_in_threadpool(
+        failed_jobs = await run_db_read(
             repository.list_scan_jobs_by_status,
             project_id,
             [ScanJobStatus.failed_permanent.value],
+            fields=["_id"],
         )
         if not failed_jobs:
             raise HTTPException(
                 status_code=400,
                 detail="Project already finished with no failed commits to retry.",
             )
-        for job in failed_jobs:
-            await run_in_threadpool(
-                repository.update_scan_job,
-                job["id"],
-                status=ScanJobStatus.pending.value,
-                last_error=None,
-                retry_count=0,
-                last_worker_id=None,
-                last_started_at=None,
-                last_finished_at=None,
-            )
-            run_scan_job.delay(job["id"])
-            failed_record = await run_in_threadpool(
-                repository.get_failed_commit_by_job,
-                job["id"],
-            )
-            if failed_record:
-                await run_in_threadpool(
-                    repository.update_failed_commit,
-                    failed_record["id"],
-                    status="queued",
-                    counted=False,
-                )
+        await run_db_write(_reset_failed_jobs, failed_jobs)
+        group(run_scan_job.s(job["id"]) for job in failed_jobs).apply_async()
         new_failed = max((record.get("failed_commits") or 0) - len(failed_jobs), 0)
-        await run_in_threadpool(
+        await run_db_write(
             repository.update_project,
             project_id,
             status=ProjectStatus.processing.value,
             failed_commits=new_failed,
         )
+        invalidate_project(project_id)
+        invalidate_failed_commits()
         return {"status": "retrying_failed", "count": len(failed_jobs)}
 
     raise HTTPException(status_code=400, detail="Unsupported project state.")
@@ -182,34 +228,40 @@ async def trigger_collection(project_id: str) -> dict:
 async def update_sonar_config(
     project_id: str, config_file: UploadFile = File(...)
 ) -> Project:
-    record = await run_in_threadpool(repository.get_project, project_id)
+    record = await async_repository.get_project(project_id)
     if not record:
         raise HTTPException(status_code=404, detail="Project not found")
     repo_key = record.get("project_key") or record.get("project_name")
-    sonar_config = _build_sonar_config(
+    sonar_config = await run_in_threadpool(
+        _build_sonar_config,
         config_file,
         repo_key,
         record.get("sonar_config"),
     )
-    updated = await run_in_threadpool(
+    updated = await run_db_write(
         repository.update_project, project_id, sonar_config=sonar_config
     )
     if not updated:
         raise HTTPException(status_code=404, detail="Failed to update config")
+    invalidate_project(project_id)
     return Project(**updated)
 
 
 @router.get("/{project_id}/results/export")
 async def download_project_results(project_id: str) -> StreamingResponse:
-    project = await run_in_threadpool(repository.get_project, project_id)
+    project = await async_repository.get_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    results = await run_in_threadpool(
-        repository.list_scan_results_by_project, project_id
-    )
-    if not results:
-        raise HTTPException(status_code=404, detail="No scan results for project")
+    # export_metrics keeps the union of metric names on the project; projects
+    # scanned before that field existed fall back to aggregating the results.
+    metric_keys = sorted(project.get("metric_keys") or [])
+    if not metric_keys:
+        metric_keys = await run_db_read(
+            repository.scan_metric_keys_by_project, project_id
+        )
+        if metric_keys is None:
+            raise HTTPException(status_code=404, detail="No scan results for project")
 
     def _component_parts(
         component_key: Optional[str],
@@ -222,9 +274,6 @@ async def download_project_results(project_id: str) -> StreamingResponse:
         repo_slug = repo_part.replace("_", "/")
         return repo_slug, commit_part
 
-    metric_keys = sorted(
-        {key for item in results for key in (item.get("metrics") or {}).keys()}
-    )
     headers = [
         "repo_name",
         "commit",
@@ -237,29 +286,42 @@ async def download_project_results(project_id: str) -> StreamingResponse:
         buffer = io.StringIO()
         writer = csv.writer(buffer)
         writer.writerow(headers)
-        yield buffer.getvalue()
-        buffer.seek(0)
-        buffer.truncate(0)
-
-        for item in results:
-            metrics = item.get("metrics") or {}
-            repo_slug, commit_sha = _component_parts(item.get("sonar_project_key"))
-            row = [
-                repo_slug,
-                commit_sha,
-                item.get("job_id"),
-                (
-                    item.get("created_at").isoformat()
-                    if hasattr(item.get("created_at"), "isoformat")
-                    else item.get("created_at")
-                ),
-            ]
-            row.extend([metrics.get(key, "") for key in metric_keys])
-            writer.writerow(row)
 
+        results = repository.iter_scan_results_by_project(
+            project_id, fields=_EXPORT_FIELDS
+        )
+        try:
+            while True:
+                # Pull one chunk per thread hop; the cursor fetches lazily.
+                batch = await run_db_read(list, islice(results, _EXPORT_BATCH_ROWS))
+                if not batch:
+                    break
+                for item in batch:
+                    metrics = item.get("metrics") or {}
+                    repo_slug, commit_sha = _component_parts(
+                        item.get("sonar_project_key")
+                    )
+                    row = [
+                        repo_slug,
+                        commit_sha,
+                        item.get("job_id"),
+                        (
+                            item.get("created_at").isoformat()
+                            if hasattr(item.get("created_at"), "isoformat")
+                            else item.get("created_at")
+                        ),
+                    ]
+                    row.extend([metrics.get(key, "") for key in metric_keys])
+                    writer.writerow(row)
+
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+        finally:
+            results.close()
+
+        if buffer.tell():
             yield buffer.getvalue()
-            buffer.seek(0)
-            buffer.truncate(0)
 
     filename = f"{project.get('project_key') or project_id}_scan_results.csv"
 
@@ -1,53 +1,69 @@
 from __future__ import annotations
 
-import json
-from typing import Optional
+import asyncio
+from typing import Any, Dict, Optional, Tuple
 
+import orjson
+from celery.app.control import Inspect
 from fastapi import APIRouter, HTTPException, Query
 from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 
 from app.celery_app import celery_app
-from app.core.config import settings
-from app.models import ScanJob, ScanJobStatus
+from app.core.cache import TTLCache
+from app.core.concurrency import run_db_read, run_db_write
+from app.models import PaginatedScanJobs, ScanJob, ScanJobStatus
 from app.services import repository
 from app.tasks.sonar import run_scan_job
 
 router = APIRouter()
 
+# Every inspect() broadcast blocks for the broker reply timeout, so dashboard
+# polls share one round of results for a few seconds.
+_INSPECT_CACHE = TTLCache(ttl=3.0, maxsize=1)
+_INSPECT_LOCK = asyncio.Lock()
+_INSPECT_TIMEOUT = 1.0
+# Worker membership changes rarely; re-ping for destinations twice a minute.
+_INSPECTOR_CACHE = TTLCache(ttl=30.0, maxsize=1)
+
 
 class RetryScanJobRequest(BaseModel):
     config_override: Optional[str] = None
     config_source: Optional[str] = None
 
 
-@router.get("/")
+@router.get("/", response_model=PaginatedScanJobs)
 async def list_scan_jobs(
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=1000),
     sort_by: Optional[str] = Query(default=None),
     sort_dir: str = Query(default="desc"),
     filters: Optional[str] = Query(default=None),
+    after: Optional[str] = Query(default=None),
 ) -> dict:
 
-    parsed_filters = json.loads(filters) if filters else None
-    result = await run_in_threadpool(
+    parsed_filters = orjson.loads(filters) if filters else None
+    result = await run_db_read(
         repository.list_scan_jobs_paginated,
         page,
         page_size,
         sort_by,
         sort_dir,
         parsed_filters,
+        after,
     )
     return {
-        "items": [ScanJob(**job) for job in result["items"]],
+        "items": result["items"],
         "total": result["total"],
+        "next_cursor": result["next_cursor"],
     }
 
 
-@router.post("/{job_id}/retry", response_model=ScanJob)
-async def retry_scan_job(job_id: str, payload: RetryScanJobRequest) -> ScanJob:
-    job = await run_in_threadpool(repository.get_scan_job, job_id)
+def _reset_scan_job(
+    job_id: str, payload: RetryScanJobRequest
+) -> Optional[Dict[str, Any]]:
+    """Load and reset a scan job to pending within one worker thread."""
+    job = repository.get_scan_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Scan job not found")
 
@@ -58,14 +74,18 @@ async def retry_scan_job(job_id: str, payload: RetryScanJobRequest) -> ScanJob:
             payload.config_source or job.get("config_source") or "text"
         )
 
-    updated = await run_in_threadpool(
-        repository.update_scan_job,
+    return repository.update_scan_job(
         job_id,
         status=ScanJobStatus.pending.value,
         last_error=None,
         last_worker_id=None,
         **update_kwargs,
     )
+
+
+@router.post("/{job_id}/retry", response_model=ScanJob)
+async def retry_scan_job(job_id: str, payload: RetryScanJobRequest) -> ScanJob:
+    updated = await run_db_write(_reset_scan_job, job_id, payload)
     if not updated:
         raise HTTPException(status_code=404, detail="Failed to update scan job")
 
@@ -73,145 +93,188 @@ async def retry_scan_job(job_id: str, payload: RetryScanJobRequest) -> ScanJob:
     return ScanJob(**updated)
 
 
-@router.get("/workers-stats")
-async def get_workers_stats() -> dict:
-    try:
-        # Get active workers
-        inspect = celery_app.control.inspect()
-        active_tasks = inspect.active() or {}
-
-        # Get reserved tasks (queued but not yet running)
-        reserved_tasks = inspect.reserved() or {}
+def _worker_inspector() -> Inspect:
+    """Return a shared Inspect addressed to the workers that answered a ping.
 
-        # Get worker stats
-        stats = inspect.stats() or {}
+    With explicit destinations a broadcast returns as soon as every known
+    worker has replied instead of always waiting out the timeout.
+    """
+    inspector = _INSPECTOR_CACHE.get("inspect")
+    if inspector is None:
+        replies = celery_app.control.ping(timeout=_INSPECT_TIMEOUT) or []
+        known = sorted(name for reply in replies for name in reply)
+        # No replies: fall back to a plain broadcast so new workers show up.
+        inspector = celery_app.control.inspect(
+            destination=known or None, timeout=_INSPECT_TIMEOUT
+        )
+        _INSPECTOR_CACHE.set("inspect", inspector)
+    return inspector
+
+
+async def _collect_inspect() -> Tuple[dict, dict, dict, dict]:
+    """Issue the worker broadcasts in parallel; each waits on broker replies."""
+    inspect = await run_in_threadpool(_worker_inspector)
+    active_tasks, reserved_tasks, stats, active_queues = await asyncio.gather(
+        run_in_threadpool(inspect.active),
+        run_in_threadpool(inspect.reserved),
+        run_in_threadpool(inspect.stats),
+        run_in_threadpool(inspect.active_queues),
+        return_exceptions=True,
+    )
+    for result in (active_tasks, reserved_tasks, stats):
+        if isinstance(result, BaseException):
+            raise result
+    # active_queues only refines the scan-worker filter; tolerate its failure.
+    if isinstance(active_queues, BaseException):
+        active_queues = None
+    return active_tasks or {}, reserved_tasks or {}, stats or {}, active_queues or {}
+
+
+def _extract_concurrency(worker_stats: dict) -> int:
+    """Extract a worker's pool concurrency from its inspect stats."""
+    if not isinstance(worker_stats, dict):
+        return 0
+    pool = worker_stats.get("pool") or {}
+    # Try multiple possible keys that may appear depending on pool impl
+    for key in (
+        "max-concurrency",
+        "max_concurrency",
+        "processes",
+        "maxchildren",
+        "max_children",
+    ):
+        val = pool.get(key) if isinstance(pool, dict) else None
+        if isinstance(val, int) and val > 0:
+            return val
+        try:
+            if val is not None:
+                ival = int(val)
+                if ival > 0:
+                    return ival
+        except Exception:
+            pass
+    # fallback: some stats expose 'pool' as a string
+    try:
+        return int(
+            worker_stats.get("max-concurrency")
+            or worker_stats.get("max_concurrency")
+            or 0
+        )
+    except Exception:
+        return 0
 
-        # Calculate total workers and concurrency for the scan queue.
-        total_workers = 0
-        max_concurrency = 0
 
+def _summarise_workers(
+    active_tasks: dict, reserved_tasks: dict, stats: dict, active_queues: dict
+) -> dict:
+    """Reduce raw inspect replies to the scan-worker view the dashboard shows."""
+    # Calculate total workers and concurrency for the scan queue.
+    total_workers = 0
+    max_concurrency = 0
+
+    # Sum concurrency for workers that listen on pipeline.scan only.
+    scan_queue_name = "pipeline.scan"
+    scan_worker_concurrency: dict = {}
+    for worker_name, wstats in stats.items():
+        queues = []
         try:
-            active_queues = inspect.active_queues() or {}
+            qinfo = active_queues.get(worker_name) or []
+            queues = [q.get("name") for q in qinfo if isinstance(q, dict)]
         except Exception:
-            active_queues = {}
-
-        # Helper to extract concurrency from stats for a worker
-        def _extract_concurrency(worker_stats: dict) -> int:
-            if not isinstance(worker_stats, dict):
-                return 0
-            pool = worker_stats.get("pool") or {}
-            # Try multiple possible keys that may appear depending on pool impl
-            for key in (
-                "max-concurrency",
-                "max_concurrency",
-                "processes",
-                "maxchildren",
-                "max_children",
-            ):
-                val = pool.get(key) if isinstance(pool, dict) else None
-                if isinstance(val, int) and val > 0:
-                    return val
-                try:
-                    if val is not None:
-                        ival = int(val)
-                        if ival > 0:
-                            return ival
-                except Exception:
-                    pass
-            # fallback: some stats expose 'pool' as a string
-            try:
-                return int(
-                    worker_stats.get("max-concurrency")
-                    or worker_stats.get("max_concurrency")
-                    or 0
-                )
-            except Exception:
-                return 0
-
-        # Sum concurrency for workers that listen on pipeline.scan only.
-        scan_queue_name = "pipeline.scan"
-        scan_worker_concurrency: dict = {}
-        for worker_name, wstats in stats.items():
             queues = []
-            try:
-                qinfo = active_queues.get(worker_name) or []
-                queues = [q.get("name") for q in qinfo if isinstance(q, dict)]
-            except Exception:
-                queues = []
-
-            if scan_queue_name not in queues:
-                continue
-
-            concurrency = _extract_concurrency(wstats)
-            max_concurrency += concurrency
-            scan_worker_concurrency[worker_name] = concurrency
-
-        total_workers = len(scan_worker_concurrency)
-
-        # Process active tasks to get worker details (only include scan workers)
-        workers = []
-        for worker_name, tasks in active_tasks.items():
-            # Only include workers that are consuming pipeline.scan
-            if worker_name not in scan_worker_concurrency:
-                continue
-            worker_max = scan_worker_concurrency.get(worker_name, 0) or 0
-            worker_info = {
-                "name": worker_name,
-                "active_tasks": len(tasks),
-                "max_concurrency": worker_max,
-                "tasks": [],
-            }
-
-            for task in tasks:
-                task_args = task.get("args", [])
-                task_kwargs = task.get("kwargs", {})
-
-                # Extract commit and repo info from task arguments
-                current_commit = None
-                current_repo = None
-
-                if task.get("name") == "app.tasks.sonar.run_scan_job":
-                    # Arguments: scan_job_id
-                    if task_args:
-                        current_commit = task_args[0]
-                    elif "scan_job_id" in task_kwargs:
-                        current_commit = task_kwargs["scan_job_id"]
-
-                worker_info["tasks"].append(
-                    {
-                        "id": task.get("id"),
-                        "name": task.get("name"),
-                        "current_commit": current_commit,
-                        "current_repo": current_repo,
-                    }
-                )
-
-            workers.append(worker_info)
-
-        # Count total active scan tasks
-        total_active_scans = sum(
-            len([t for t in tasks if t.get("name") == "app.tasks.sonar.run_scan_job"])
-            for tasks in active_tasks.values()
-        )
-
-        # Count reserved scan tasks
-        total_reserved_scans = sum(
-            len([t for t in tasks if t.get("name") == "app.tasks.sonar.run_scan_job"])
-            for tasks in reserved_tasks.values()
-        )
 
-        return {
-            "total_workers": total_workers,
-            "max_concurrency": max_concurrency,
-            "active_scan_tasks": total_active_scans,
-            "queued_scan_tasks": total_reserved_scans,
-            "workers": workers,
+        if scan_queue_name not in queues:
+            continue
+
+        concurrency = _extract_concurrency(wstats)
+        max_concurrency += concurrency
+        scan_worker_concurrency[worker_name] = concurrency
+
+    total_workers = len(scan_worker_concurrency)
+
+    # Process active tasks to get worker details (only include scan workers)
+    workers = []
+    for worker_name, tasks in active_tasks.items():
+        # Only include workers that are consuming pipeline.scan
+        if worker_name not in scan_worker_concurrency:
+            continue
+        worker_max = scan_worker_concurrency.get(worker_name, 0) or 0
+        worker_info = {
+            "name": worker_name,
+            "active_tasks": len(tasks),
+            "max_concurrency": worker_max,
+            "tasks": [],
         }
+
+        for task in tasks:
+            task_args = task.get("args", [])
+            task_kwargs = task.get("kwargs", {})
+
+            # Extract commit and repo info from task arguments
+            current_commit = None
+            current_repo = None
+
+            if task.get("name") == "app.tasks.sonar.run_scan_job":
+                # Arguments: scan_job_id
+                if task_args:
+                    current_commit = task_args[0]
+                elif "scan_job_id" in task_kwargs:
+                    current_commit = task_kwargs["scan_job_id"]
+
+            worker_info["tasks"].append(
+                {
+                    "id": task.get("id"),
+                    "name": task.get("name"),
+                    "current_commit": current_commit,
+                    "current_repo": current_repo,
+                }
+            )
+
+        workers.append(worker_info)
+
+    # Count total active scan tasks
+    total_active_scans = sum(
+        len([t for t in tasks if t.get("name") == "app.tasks.sonar.run_scan_job"])
+        for tasks in active_tasks.values()
+    )
+
+    # Count reserved scan tasks
+    total_reserved_scans = sum(
+        len([t for t in tasks if t.get("name") == "app.tasks.sonar.run_scan_job"])
+        for tasks in reserved_tasks.values()
+    )
+
+    return {
+        "total_workers": total_workers,
+        "max_concurrency": max_concurrency,
+        "active_scan_tasks": total_active_scans,
+        "queued_scan_tasks": total_reserved_scans,
+        "workers": workers,
+    }
+
+
+async def _workers_stats() -> dict:
+    cached = _INSPECT_CACHE.get("workers")
+    if cached is not None:
+        return cached
+    async with _INSPECT_LOCK:
+        # Polls that queued behind the lock reuse the broadcast that just ran.
+        cached = _INSPECT_CACHE.get("workers")
+        if cached is None:
+            cached = _summarise_workers(*await _collect_inspect())
+            _INSPECT_CACHE.set("workers", cached)
+        return cached
+
+
+@router.get("/workers-stats")
+async def get_workers_stats() -> dict:
+    try:
+        return await _workers_stats()
     except Exception as e:
         # If workers are not available, return empty stats
         return {
             "total_workers": 0,
-            "max_concurrency": settings.pipeline.sonar_parallelism,
+            "max_concurrency": 0,
             "active_scan_tasks": 0,
             "queued_scan_tasks": 0,
             "workers": [],
@@ -1,44 +1,47 @@
 from __future__ import annotations
 
-import json
 from typing import Optional
 
+import orjson
 from fastapi import APIRouter, HTTPException, Query
-from fastapi.concurrency import run_in_threadpool
 
-from app.models import ScanResult
-from app.services import repository
+from app.core.concurrency import run_db_read
+from app.models import PaginatedScanResults, ScanResult
+from app.services import async_repository, repository
 
 router = APIRouter()
 
 
-@router.get("/")
+@router.get("/", response_model=PaginatedScanResults)
 async def list_scan_results(
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=1000),
     sort_by: Optional[str] = Query(default=None),
     sort_dir: str = Query(default="desc"),
     filters: Optional[str] = Query(default=None),
+    after: Optional[str] = Query(default=None),
 ) -> dict:
 
-    parsed_filters = json.loads(filters) if filters else None
-    result = await run_in_threadpool(
+    parsed_filters = orjson.loads(filters) if filters else None
+    result = await run_db_read(
         repository.list_scan_results_paginated,
         page,
         page_size,
         sort_by,
         sort_dir,
         parsed_filters,
+        after,
     )
     return {
-        "items": [ScanResult(**doc) for doc in result["items"]],
+        "items": result["items"],
         "total": result["total"],
+        "next_cursor": result["next_cursor"],
     }
 
 
 @router.get("/{result_id}", response_model=ScanResult)
 async def get_scan_result(result_id: str) -> ScanResult:
-    record = await run_in_threadpool(repository.get_scan_result, result_id)
+    record = await async_repository.get_scan_result(result_id)
     if not record:
         raise HTTPException(status_code=404, detail="Scan result not found")
     return ScanResult(**record)
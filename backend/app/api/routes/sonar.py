@@ -2,56 +2,65 @@ from __future__ import annotations
 
 import hashlib
 import hmac
-import json
 from typing import Optional
 
+import orjson
 from fastapi import APIRouter, Header, HTTPException, Request, Query
-from fastapi.concurrency import run_in_threadpool
 
+from app.core.concurrency import run_db_read
 from app.core.config import settings
-from app.models import ScanJobStatus, ScanResult
-from app.services import repository
+from app.models import PaginatedScanResults, ScanJobStatus
+from app.services import async_repository, repository
 from app.tasks.sonar import export_metrics
 import logging
 
 router = APIRouter()
 LOG = logging.getLogger("sonar_api")
 
+_WEBHOOK_SECRET = settings.sonarqube.webhook_secret
+# Keyed once at import; copying skips re-deriving the inner/outer pads per call.
+_WEBHOOK_HMAC = hmac.new(_WEBHOOK_SECRET.encode("utf-8"), digestmod=hashlib.sha256)
 
-@router.get("/runs")
+
+@router.get("/runs", response_model=PaginatedScanResults)
 async def list_runs(
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=50, ge=1, le=1000),
     sort_by: Optional[str] = Query(default=None),
     sort_dir: str = Query(default="desc"),
     filters: Optional[str] = Query(default=None),
+    after: Optional[str] = Query(default=None),
 ) -> dict:
-    parsed_filters = json.loads(filters) if filters else None
-    result = await run_in_threadpool(
+    parsed_filters = orjson.loads(filters) if filters else None
+    result = await run_db_read(
         repository.list_scan_results_paginated,
         page,
         page_size,
         sort_by,
         sort_dir,
         parsed_filters,
+        after,
     )
     return {
-        "items": [ScanResult(**run) for run in result["items"]],
+        "items": result["items"],
         "total": result["total"],
+        "next_cursor": result["next_cursor"],
     }
 
 
 def _validate_signature(
-    body: bytes, signature: Optional[str], token_header: Optional[str]
+    mac: hmac.HMAC, signature: Optional[str], token_header: Optional[str]
 ) -> None:
-    secret = settings.sonarqube.webhook_secret
     if token_header:
-        if token_header != secret:
+        if token_header != _WEBHOOK_SECRET:
             raise HTTPException(status_code=401, detail="Invalid webhook secret")
         return
     if signature:
-        computed = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
-        if not hmac.compare_digest(computed, signature):
+        try:
+            expected = bytes.fromhex(signature)
+        except ValueError:
+            raise HTTPException(status_code=401, detail="Invalid webhook signature")
+        if not hmac.compare_digest(mac.digest(), expected):
             raise HTTPException(status_code=401, detail="Invalid webhook signature")
     else:
         raise HTTPException(status_code=401, detail="Webhook secret missing")
@@ -63,16 +72,21 @@ async def sonar_webhook(
     x_sonar_webhook_hmac_sha256: Optional[str] = Header(default=None),
     x_sonar_secret: Optional[str] = Header(default=None),
 ) -> dict:
-    body = await request.body()
-    _validate_signature(body, x_sonar_webhook_hmac_sha256, x_sonar_secret)
-    payload = json.loads(body.decode("utf-8") or "{}")
+    # Hash chunks as they arrive rather than re-walking the buffered body.
+    mac = _WEBHOOK_HMAC.copy()
+    body = bytearray()
+    async for chunk in request.stream():
+        mac.update(chunk)
+        body += chunk
+    _validate_signature(mac, x_sonar_webhook_hmac_sha256, x_sonar_secret)
+    payload = orjson.loads(body) if body else {}
     LOG.debug("Received SonarQube webhook: %s", payload)
     component_key = payload.get("project", {}).get("key")
     if not component_key:
         raise HTTPException(status_code=400, detail="project key missing")
 
-    scan_job = await run_in_threadpool(
-        repository.find_scan_job_by_component, component_key
+    scan_job = await async_repository.find_scan_job_by_component(
+        component_key, fields=["project_id", "commit_sha"]
     )
     if not scan_job:
         raise HTTPException(status_code=404, detail="Scan job not tracked")
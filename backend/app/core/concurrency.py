@@ -0,0 +1,28 @@
+"""Bounded worker-thread dispatch for blocking calls made from async routes."""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import Any, Callable, TypeVar
+
+import anyio
+import anyio.to_thread
+
+T = TypeVar("T")
+
+# Reads and writes get their own limiters so a burst of slow writes (or a slow
+# Mongo) cannot exhaust AnyIO's shared thread pool and starve quick lookups.
+DB_READ_LIMITER = anyio.CapacityLimiter(16)
+DB_WRITE_LIMITER = anyio.CapacityLimiter(8)
+
+
+async def run_db_read(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    return await anyio.to_thread.run_sync(
+        partial(func, *args, **kwargs), limiter=DB_READ_LIMITER
+    )
+
+
+async def run_db_write(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    return await anyio.to_thread.run_sync(
+        partial(func, *args, **kwargs), limiter=DB_WRITE_LIMITER
+    )
@@ -1,11 +1,15 @@
 from __future__ import annotations
+import asyncio
 import logging
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.routes import api_router
 from app.core.config import settings
+from app.services import async_repository, repository
+from app.services.repository_base import InvalidCursorError
 
 # Configure logging from settings. `settings.logging.level` defaults to "INFO".
 try:
@@ -16,12 +20,14 @@ except Exception:
 # Resolve to a numeric level; fallback to INFO if unknown.
 numeric_level = getattr(logging, str(level_name).upper(), logging.INFO)
 logging.basicConfig(level=numeric_level)
+LOG = logging.getLogger(__name__)
 
 
 app = FastAPI(
     title="Build Commit Pipeline",
     version="0.1.0",
     description="Pipeline orchestrator for TravisTorrent data ingestion and SonarQube enrichment.",
+    default_response_class=ORJSONResponse,
 )
 
 origins = {settings.web.base_url, "http://localhost:3000", "http://127.0.0.1:3000"}
@@ -37,6 +43,35 @@ app.add_middleware(
 app.include_router(api_router, prefix="/api")
 
 
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(
+    request: Request, exc: InvalidCursorError
+) -> ORJSONResponse:
+    return ORJSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+def _ensure_indexes() -> None:
+    try:
+        repository.ensure_indexes()
+    except Exception:
+        # Mongo may not be up yet (compose depends_on does not wait for it);
+        # the API keeps serving and the next boot retries.
+        LOG.exception("Could not create MongoDB indexes at startup")
+
+
+@app.on_event("startup")
+async def create_indexes() -> None:
+    if settings.mongo.ensure_indexes:
+        # Run in a worker thread without awaiting it, so boot never blocks on
+        # server selection.
+        asyncio.get_running_loop().run_in_executor(None, _ensure_indexes)
+
+
+@app.on_event("shutdown")
+def close_async_repository() -> None:
+    async_repository.close()
+
+
 @app.get("/health", tags=["health"])
 def healthcheck() -> dict[str, str]:
     return {"status": "ok"}
@@ -2,6 +2,10 @@
 
 from .schemas import (
     FailedCommit,
+    PaginatedFailedCommits,
+    PaginatedProjects,
+    PaginatedScanJobs,
+    PaginatedScanResults,
     Project,
     ProjectStatus,
     ScanJob,
@@ -12,6 +16,10 @@ from .schemas import (
 
 __all__ = [
     "FailedCommit",
+    "PaginatedFailedCommits",
+    "PaginatedProjects",
+    "PaginatedScanJobs",
+    "PaginatedScanResults",
     "Project",
     "ProjectStatus",
     "ScanJob",
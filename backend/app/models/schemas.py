@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -87,3 +87,30 @@ class FailedCommit(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime] = None
     resolved_at: Optional[datetime] = None
+
+
+# List routes return raw repository pages with these as response_model, so each
+# row is validated exactly once there (filling defaults for fields that stored
+# documents omit). Handlers must not build the item models themselves.
+class PaginatedProjects(BaseModel):
+    items: List[Project]
+    total: int
+    next_cursor: Optional[str] = None
+
+
+class PaginatedScanJobs(BaseModel):
+    items: List[ScanJob]
+    total: int
+    next_cursor: Optional[str] = None
+
+
+class PaginatedScanResults(BaseModel):
+    items: List[ScanResult]
+    total: int
+    next_cursor: Optional[str] = None
+
+
+class PaginatedFailedCommits(BaseModel):
+    items: List[FailedCommit]
+    total: int
+    next_cursor: Optional[str] = None
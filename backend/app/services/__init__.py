@@ -1,11 +1,14 @@
 """Service layer exports."""
 
+from .async_repository import AsyncRepository, async_repository
 from .files import LocalFileService, file_service
 from .repository import Repository, repository
 
 MongoRepository = Repository
 
 __all__ = [
+    "AsyncRepository",
+    "async_repository",
     "LocalFileService",
     "file_service",
     "Repository",
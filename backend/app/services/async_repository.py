@@ -0,0 +1,72 @@
+"""Async (motor) read path for the API's hottest single-document lookups.
+
+The sync repositories remain the source of truth for writes and for Celery
+workers; this only lets request handlers await by-id reads directly on the
+event loop instead of hopping to a worker thread.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+
+from app.core.config import settings
+from app.services.repository_base import MongoRepositoryBase, object_id
+
+
+class AsyncRepository:
+    def __init__(self) -> None:
+        self._client: Optional[AsyncIOMotorClient] = None
+        self._db: Optional[AsyncIOMotorDatabase] = None
+        self.collections = settings.storage
+
+    @property
+    def db(self) -> AsyncIOMotorDatabase:
+        # Created on first use so the client binds to the server's running loop.
+        if self._db is None:
+            self._client = AsyncIOMotorClient(
+                settings.mongo.uri, **settings.mongo.client_options()
+            )
+            self._db = self._client[settings.mongo.database]
+        return self._db
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+            self._db = None
+
+    async def _get_by_id(
+        self, collection: str, record_id: str
+    ) -> Optional[Dict[str, Any]]:
+        doc = await self.db[collection].find_one({"_id": object_id(record_id)})
+        return MongoRepositoryBase._serialize(doc) if doc else None
+
+    async def get_project(self, project_id: str) -> Optional[Dict[str, Any]]:
+        return await self._get_by_id(self.collections.projects_collection, project_id)
+
+    async def get_scan_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self._get_by_id(self.collections.scan_jobs_collection, job_id)
+
+    async def find_scan_job_by_component(
+        self, component_key: str, fields: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """``fields`` limits the returned document to those paths (plus ``id``)."""
+        doc = await self.db[self.collections.scan_jobs_collection].find_one(
+            {"component_key": component_key}, fields
+        )
+        return MongoRepositoryBase._serialize(doc) if doc else None
+
+    async def get_scan_result(self, result_id: str) -> Optional[Dict[str, Any]]:
+        return await self._get_by_id(
+            self.collections.scan_results_collection, result_id
+        )
+
+    async def get_failed_commit(self, record_id: str) -> Optional[Dict[str, Any]]:
+        return await self._get_by_id(
+            self.collections.failed_commits_collection, record_id
+        )
+
+
+async_repository = AsyncRepository()
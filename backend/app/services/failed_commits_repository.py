@@ -3,25 +3,53 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from bson import ObjectId
-from pymongo import ReturnDocument
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument
 
-from app.services.repository_base import MongoRepositoryBase
+from app.services.repository_base import MongoRepositoryBase, object_id
 
+# Which record counts as "the" failed commit of a job that has several; it
+# follows the (payload.job_id, counted, _id) index, so no extra sort is needed.
+_FIRST_BY_JOB = [("counted", ASCENDING), ("_id", ASCENDING)]
 
 class FailedCommitsRepository(MongoRepositoryBase):
+    def ensure_indexes(self) -> None:
+        self.db[self.collections.failed_commits_collection].create_indexes(
+            [
+                IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+                IndexModel(
+                    [
+                        ("status", ASCENDING),
+                        ("created_at", DESCENDING),
+                        ("_id", DESCENDING),
+                    ]
+                ),
+                # Covers get_failed_commit_by_job(fields=["counted"]) outright.
+                IndexModel(
+                    [
+                        ("payload.job_id", ASCENDING),
+                        ("counted", ASCENDING),
+                        ("_id", ASCENDING),
+                    ]
+                ),
+                IndexModel([("payload.project_id", ASCENDING)]),
+            ]
+        )
+
     def insert_failed_commit(self, payload: Dict[str, Any], reason: str) -> Dict[str, Any]:
         now = datetime.utcnow()
+        commit = payload.get("commit", {})
         doc = {
             "payload": payload,
             "reason": reason,
             "status": "pending",
-            "config_override": payload.get("commit", {}).get("config_override"),
-            "config_source": payload.get("commit", {}).get("config_source"),
             "counted": True,
             "created_at": now,
             "updated_at": now,
         }
+        # Only store overrides that exist; absent fields read back as None.
+        for field in ("config_override", "config_source"):
+            if commit.get(field) is not None:
+                doc[field] = commit[field]
         result = self.db[self.collections.failed_commits_collection].insert_one(doc)
         doc["id"] = str(result.inserted_id)
         return doc
@@ -32,6 +60,7 @@ class FailedCommitsRepository(MongoRepositoryBase):
             .find()
             .sort("created_at", -1)
             .limit(limit)
+            .batch_size(limit)
         )
         return [self._serialize(doc) for doc in cursor]
 
@@ -42,38 +71,42 @@ class FailedCommitsRepository(MongoRepositoryBase):
         sort_by: Optional[str] = None,
         sort_dir: str = "desc",
         filters: Optional[Dict[str, Any]] = None,
+        after: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Return paginated failed commits and total count (page is 1-based)."""
-        if page < 1:
-            page = 1
-        skip = (page - 1) * page_size
         collection = self.db[self.collections.failed_commits_collection]
-        query = filters or {}
+        filterable = {"status", "payload.job_id", "payload.project_id"}
+        query = self._filter_query(filters, filterable)
 
         allowed = {"created_at", "status"}
         sort_field = sort_by if sort_by in allowed else "created_at"
         sort_direction = -1 if sort_dir.lower() == "desc" else 1
 
-        total = collection.count_documents(query)
-        cursor = (
-            collection.find(query)
-            .sort(sort_field, sort_direction)
-            .skip(skip)
-            .limit(page_size)
+        return self._paginate(
+            collection,
+            query,
+            page=page,
+            page_size=page_size,
+            sort_field=sort_field,
+            sort_direction=sort_direction,
+            after=after,
         )
-        items = [self._serialize(doc) for doc in cursor]
-        return {"items": items, "total": total}
 
-    def get_failed_commit(self, record_id: str) -> Optional[Dict[str, Any]]:
+    def get_failed_commit(
+        self, record_id: str, fields: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Return a failed commit; ``fields`` limits the document to those paths."""
         doc = self.db[self.collections.failed_commits_collection].find_one(
-            {"_id": ObjectId(record_id)}
+            {"_id": object_id(record_id)}, fields
         )
         return self._serialize(doc) if doc else None
 
-    def get_failed_commit_by_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+    def get_failed_commit_by_job(
+        self, job_id: str, fields: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
         """Return the failed commit record created for a specific scan job."""
         doc = self.db[self.collections.failed_commits_collection].find_one(
-            {"payload.job_id": job_id}
+            {"payload.job_id": job_id}, fields, sort=_FIRST_BY_JOB
         )
         return self._serialize(doc) if doc else None
 
@@ -87,8 +120,10 @@ class FailedCommitsRepository(MongoRepositoryBase):
         resolved_at: Any = None,
         payload: Any = None,
         counted: Optional[bool] = None,
+        now: Optional[datetime] = None,
+        return_doc: bool = True,
     ) -> Optional[Dict[str, Any]]:
-        updates: Dict[str, Any] = {"updated_at": datetime.utcnow()}
+        updates: Dict[str, Any] = {}
         if config_override is not None:
             updates["config_override"] = config_override
         if config_source is not None:
@@ -101,13 +136,74 @@ class FailedCommitsRepository(MongoRepositoryBase):
             updates["payload"] = payload
         if counted is not None:
             updates["counted"] = counted
+        return self._update_by_id(
+            self.collections.failed_commits_collection,
+            record_id,
+            self._set_stamped(updates, now),
+            return_doc,
+        )
+
+    def resolve_counted_by_job(
+        self, job_id: str, resolved_at: datetime
+    ) -> Optional[Dict[str, Any]]:
+        """Atomically resolve a job's still-counted failed commit, if any."""
         doc = self.db[self.collections.failed_commits_collection].find_one_and_update(
-            {"_id": ObjectId(record_id)},
-            {"$set": updates},
+            {"payload.job_id": job_id, "counted": {"$ne": False}},
+            {
+                "$set": {
+                    "status": "resolved",
+                    "resolved_at": resolved_at,
+                    "counted": False,
+                    "updated_at": resolved_at,
+                }
+            },
             return_document=ReturnDocument.AFTER,
         )
         return self._serialize(doc) if doc else None
 
+    def bulk_update_by_job_ids(
+        self,
+        job_ids: List[str],
+        *,
+        status: Optional[str] = None,
+        counted: Optional[bool] = None,
+        now: Optional[datetime] = None,
+    ) -> int:
+        """Update the record get_failed_commit_by_job returns for each job.
+
+        Further records of a job are left alone, as the per-job loop did.
+        """
+        if not job_ids:
+            return 0
+        collection = self.db[self.collections.failed_commits_collection]
+        first_ids = [
+            row["_id"]
+            for row in collection.aggregate(
+                [
+                    {"$match": {"payload.job_id": {"$in": job_ids}}},
+                    {"$sort": {"payload.job_id": ASCENDING, **dict(_FIRST_BY_JOB)}},
+                    {
+                        "$group": {
+                            "_id": "$payload.job_id",
+                            "first": {"$first": "$_id"},
+                        }
+                    },
+                    {"$project": {"_id": "$first"}},
+                ]
+            )
+        ]
+        if not first_ids:
+            return 0
+        updates: Dict[str, Any] = {}
+        if status:
+            updates["status"] = status
+        if counted is not None:
+            updates["counted"] = counted
+        result = collection.update_many(
+            {"_id": {"$in": first_ids}}, self._set_stamped(updates, now)
+        )
+        return result.modified_count
+
     def count_by_job_id(self, job_id: str) -> int:
         """Count failed commits for a specific job."""
         return self.db[self.collections.failed_commits_collection].count_documents(
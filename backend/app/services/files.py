@@ -1,16 +1,30 @@
 from __future__ import annotations
 
+import hashlib
+import os
 import shutil
 import uuid
 import re
 from pathlib import Path
+from typing import BinaryIO, Tuple
 
-import aiofiles
 from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
 
 from app.core.config import settings
 from typing import Optional
 
+_UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def _copy_and_hash(source: BinaryIO, fd: int, hasher) -> None:
+    """Copy ``source`` into ``fd`` while hashing it, all on the calling thread."""
+    while chunk := source.read(_UPLOAD_CHUNK_SIZE):
+        hasher.update(chunk)
+        view = memoryview(chunk)
+        while view:
+            view = view[os.write(fd, view) :]
+
 
 class LocalFileService:
     def __init__(self, base_upload_dir: Path | None = None) -> None:
@@ -22,16 +36,33 @@ class LocalFileService:
         self.config_dir.mkdir(parents=True, exist_ok=True)
 
     async def save_upload(self, upload: UploadFile) -> Path:
+        target, _ = await self.save_upload_with_digest(upload)
+        return target
+
+    async def save_upload_with_digest(self, upload: UploadFile) -> Tuple[Path, str]:
+        """Persist an upload and return its path plus the SHA-256 of its contents.
+
+        The request body is already spooled by the time the handler runs, so the
+        whole copy (and the digest, in the same pass) runs in one worker-thread
+        dispatch rather than one event-loop round trip per chunk.
+        """
         target = self.upload_dir / f"{uuid.uuid4()}_{upload.filename}"
-        async with aiofiles.open(target, "wb") as out_file:
-            while chunk := await upload.read(1024 * 1024):
-                await out_file.write(chunk)
+        hasher = hashlib.sha256()
+        fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            await run_in_threadpool(_copy_and_hash, upload.file, fd, hasher)
+        finally:
+            os.close(fd)
         await upload.close()
-        return target
+        return target, hasher.hexdigest()
 
     def copy_to_exports(self, source: Path, name: str | None = None) -> Path:
         destination = self.exports_dir / (name or source.name)
-        shutil.copy2(source, destination)
+        try:
+            # Same filesystem: share the inode instead of copying the bytes.
+            os.link(source, destination)
+        except OSError:
+            shutil.copy2(source, destination)
         return destination
 
     @staticmethod
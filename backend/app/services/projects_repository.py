@@ -1,18 +1,35 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
-from pymongo import ReturnDocument
-from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from app.models import ProjectStatus
 
-from app.services.repository_base import MongoRepositoryBase
+from app.services.repository_base import MongoRepositoryBase, object_id
 
 _UNSET = object()
 
+# metric_keys grows with every exported metric and is only read by the export.
+_LIST_PROJECTION = {"metric_keys": 0}
+
 
 class ProjectsRepository(MongoRepositoryBase):
+    def ensure_indexes(self) -> None:
+        self.db[self.collections.projects_collection].create_indexes(
+            [
+                IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+                IndexModel([("project_key", ASCENDING)]),
+                IndexModel(
+                    [
+                        ("status", ASCENDING),
+                        ("created_at", DESCENDING),
+                        ("_id", DESCENDING),
+                    ]
+                ),
+            ]
+        )
+
     def create_project(
         self,
         *,
@@ -48,9 +65,10 @@ class ProjectsRepository(MongoRepositoryBase):
     def list_projects(self, limit: int = 50) -> List[Dict[str, Any]]:
         cursor = (
             self.db[self.collections.projects_collection]
-            .find()
+            .find({}, _LIST_PROJECTION)
             .sort("created_at", -1)
             .limit(limit)
+            .batch_size(limit)
         )
         return [self._serialize(doc) for doc in cursor]
 
@@ -61,31 +79,34 @@ class ProjectsRepository(MongoRepositoryBase):
         sort_by: Optional[str] = None,
         sort_dir: str = "desc",
         filters: Optional[Dict[str, Any]] = None,
+        after: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Return paginated projects and total count (page is 1-based)."""
-        if page < 1:
-            page = 1
-        skip = (page - 1) * page_size
         collection = self.db[self.collections.projects_collection]
-        query = filters or {}
+        filterable = {"status", "project_key", "project_name"}
+        query = self._filter_query(filters, filterable)
 
         allowed = {"created_at", "project_name", "status"}
         sort_field = sort_by if sort_by in allowed else "created_at"
         sort_direction = -1 if sort_dir.lower() == "desc" else 1
 
-        total = collection.count_documents(query)
-        cursor = (
-            collection.find(query)
-            .sort(sort_field, sort_direction)
-            .skip(skip)
-            .limit(page_size)
+        return self._paginate(
+            collection,
+            query,
+            page=page,
+            page_size=page_size,
+            sort_field=sort_field,
+            sort_direction=sort_direction,
+            after=after,
+            projection=_LIST_PROJECTION,
         )
-        items = [self._serialize(doc) for doc in cursor]
-        return {"items": items, "total": total}
 
-    def get_project(self, project_id: str) -> Optional[Dict[str, Any]]:
+    def get_project(
+        self, project_id: str, fields: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """``fields`` limits the returned document to those paths (plus ``id``)."""
         doc = self.db[self.collections.projects_collection].find_one(
-            {"_id": ObjectId(project_id)}
+            {"_id": object_id(project_id)}, fields
         )
         return self._serialize(doc) if doc else None
 
@@ -107,8 +128,11 @@ class ProjectsRepository(MongoRepositoryBase):
         failed_delta: Optional[int] = None,
         total_builds: Any = _UNSET,
         total_commits: Any = _UNSET,
+        metric_keys: Optional[Iterable[str]] = None,
+        now: Optional[datetime] = None,
+        return_doc: bool = True,
     ) -> Optional[Dict[str, Any]]:
-        updates: Dict[str, Any] = {"updated_at": datetime.utcnow()}
+        updates: Dict[str, Any] = {}
         if status:
             updates["status"] = status
         if processed_commits is not None:
@@ -128,13 +152,13 @@ class ProjectsRepository(MongoRepositoryBase):
         if failed_delta:
             inc["failed_commits"] = failed_delta
 
-        update_doc: Dict[str, Any] = {"$set": updates}
+        update_doc = self._set_stamped(updates, now)
         if inc:
             update_doc["$inc"] = inc
+        if metric_keys:
+            # Running union of metric names, so exports need not scan results.
+            update_doc["$addToSet"] = {"metric_keys": {"$each": list(metric_keys)}}
 
-        doc = self.db[self.collections.projects_collection].find_one_and_update(
-            {"_id": ObjectId(project_id)},
-            update_doc,
-            return_document=ReturnDocument.AFTER,
+        return self._update_by_id(
+            self.collections.projects_collection, project_id, update_doc, return_doc
         )
-        return self._serialize(doc) if doc else None
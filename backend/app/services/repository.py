@@ -14,96 +14,65 @@ class Repository:
         self.scan_results = ScanResultsRepository()
         self.failed_commits = FailedCommitsRepository()
 
-    # Project proxies
-    def create_project(self, *a, **k):
-        return self.projects.create_project(*a, **k)
-
-    def list_projects(self, *a, **k):
-        return self.projects.list_projects(*a, **k)
-
-    def list_projects_paginated(self, *a, **k):
-        return self.projects.list_projects_paginated(*a, **k)
-
-    def get_project(self, *a, **k):
-        return self.projects.get_project(*a, **k)
-
-    def find_project_by_key(self, *a, **k):
-        return self.projects.find_project_by_key(*a, **k)
-
-    def update_project(self, *a, **k):
-        return self.projects.update_project(*a, **k)
-
-    # Scan jobs
-    def create_scan_job(self, *a, **k):
-        return self.scan_jobs.create_scan_job(*a, **k)
-
-    def get_scan_job(self, *a, **k):
-        return self.scan_jobs.get_scan_job(*a, **k)
-
-    def claim_scan_job(self, *a, **k):
-        return self.scan_jobs.claim_job(*a, **k)
-
-    def update_scan_job(self, *a, **k):
-        return self.scan_jobs.update_scan_job(*a, **k)
-
-    def list_scan_jobs(self, *a, **k):
-        return self.scan_jobs.list_scan_jobs(*a, **k)
-
-    def list_scan_jobs_paginated(self, *a, **k):
-        return self.scan_jobs.list_scan_jobs_paginated(*a, **k)
-
-    def find_scan_job_by_component(self, *a, **k):
-        return self.scan_jobs.find_job_by_component_key(*a, **k)
-
-    def find_stalled_scan_jobs(self, *a, **k):
-        return self.scan_jobs.find_stalled_jobs(*a, **k)
-
-    def list_scan_jobs_by_status(self, *a, **k):
-        return self.scan_jobs.list_jobs_by_status(*a, **k)
-
-    # Scan results
-    def upsert_scan_result(self, *a, **k):
-        return self.scan_results.upsert_result(*a, **k)
-
-    def list_scan_results(self, *a, **k):
-        return self.scan_results.list_results(*a, **k)
-
-    def list_scan_results_paginated(self, *a, **k):
-        return self.scan_results.list_results_paginated(*a, **k)
-
-    def get_scan_result_by_job(self, *a, **k):
-        return self.scan_results.get_by_job_id(*a, **k)
-
-    def get_scan_result(self, *a, **k):
-        return self.scan_results.get_result(*a, **k)
-
-    def list_scan_results_by_project(self, *a, **k):
-        return self.scan_results.list_by_project(*a, **k)
-
-    # Failed commits
-    def insert_failed_commit(self, *a, **k):
-        return self.failed_commits.insert_failed_commit(*a, **k)
-
-    def list_failed_commits(self, *a, **k):
-        return self.failed_commits.list_failed_commits(*a, **k)
-
-    def list_failed_commits_paginated(self, *a, **k):
-        return self.failed_commits.list_failed_commits_paginated(*a, **k)
-
-    def get_failed_commit(self, *a, **k):
-        return self.failed_commits.get_failed_commit(*a, **k)
-
-    def get_failed_commit_by_job(self, *a, **k):
-        return self.failed_commits.get_failed_commit_by_job(*a, **k)
-
-    def update_failed_commit(self, *a, **k):
-        return self.failed_commits.update_failed_commit(*a, **k)
-
-    def count_failed_commits_by_job(self, *a, **k):
-        return self.failed_commits.count_by_job_id(*a, **k)
-
-    def count_failed_commits_by_project(self, *a, **k):
-        return self.failed_commits.count_by_project_id(*a, **k)
+        # Facade names are bound straight to the sub-repository methods, so a
+        # call costs no wrapper frame or *args/**kwargs repacking.
+
+        # Projects
+        self.create_project = self.projects.create_project
+        self.list_projects = self.projects.list_projects
+        self.list_projects_paginated = self.projects.list_projects_paginated
+        self.get_project = self.projects.get_project
+        self.find_project_by_key = self.projects.find_project_by_key
+        self.update_project = self.projects.update_project
+
+        # Scan jobs
+        self.create_scan_job = self.scan_jobs.create_scan_job
+        self.create_scan_jobs = self.scan_jobs.create_scan_jobs
+        self.get_scan_job = self.scan_jobs.get_scan_job
+        self.claim_scan_job = self.scan_jobs.claim_job
+        self.update_scan_job = self.scan_jobs.update_scan_job
+        self.bulk_update_scan_jobs = self.scan_jobs.bulk_update_scan_jobs
+        self.list_scan_jobs = self.scan_jobs.list_scan_jobs
+        self.list_scan_jobs_paginated = self.scan_jobs.list_scan_jobs_paginated
+        self.find_scan_job_by_component = self.scan_jobs.find_job_by_component_key
+        self.find_stalled_scan_jobs = self.scan_jobs.find_stalled_jobs
+        self.list_scan_jobs_by_status = self.scan_jobs.list_jobs_by_status
+
+        # Scan results
+        self.upsert_scan_result = self.scan_results.upsert_result
+        self.list_scan_results = self.scan_results.list_results
+        self.list_scan_results_paginated = self.scan_results.list_results_paginated
+        self.get_scan_result_by_job = self.scan_results.get_by_job_id
+        self.get_scan_result = self.scan_results.get_result
+        self.list_scan_results_by_project = self.scan_results.list_by_project
+        self.iter_scan_results_by_project = self.scan_results.iter_by_project
+        self.scan_metric_keys_by_project = self.scan_results.metric_keys_by_project
+
+        # Failed commits
+        self.insert_failed_commit = self.failed_commits.insert_failed_commit
+        self.list_failed_commits = self.failed_commits.list_failed_commits
+        self.list_failed_commits_paginated = (
+            self.failed_commits.list_failed_commits_paginated
+        )
+        self.get_failed_commit = self.failed_commits.get_failed_commit
+        self.get_failed_commit_by_job = self.failed_commits.get_failed_commit_by_job
+        self.update_failed_commit = self.failed_commits.update_failed_commit
+        self.resolve_failed_commit_by_job = self.failed_commits.resolve_counted_by_job
+        self.bulk_update_failed_commits_by_job = (
+            self.failed_commits.bulk_update_by_job_ids
+        )
+        self.count_failed_commits_by_job = self.failed_commits.count_by_job_id
+        self.count_failed_commits_by_project = self.failed_commits.count_by_project_id
+
+    def ensure_indexes(self) -> None:
+        """Create the indexes backing every lookup, sort and filter (idempotent)."""
+        for repo in (
+            self.projects,
+            self.scan_jobs,
+            self.scan_results,
+            self.failed_commits,
+        ):
+            repo.ensure_indexes()
 
 
 repository = Repository()
@@ -1,25 +1,207 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+import base64
+import binascii
+import os
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Collection, Dict, Optional
 
-from pymongo import MongoClient
+from bson import ObjectId, json_util
+from pymongo import MongoClient, ReturnDocument
+from pymongo.collection import Collection as MongoCollection
+from pymongo.database import Database
 
 from app.core.config import settings
 
 
+class InvalidCursorError(ValueError):
+    """Raised when a keyset pagination cursor cannot be decoded."""
+
+
+@lru_cache(maxsize=4096)
+def object_id(value: str) -> ObjectId:
+    """Parse a hex id once; workers resolve the same ids over and over."""
+    return ObjectId(value)
+
+
+@lru_cache(maxsize=None)
+def get_mongo_client() -> MongoClient:
+    """Return the process-wide client so every repository shares one pool."""
+    return MongoClient(settings.mongo.uri, **settings.mongo.client_options())
+
+
+@lru_cache(maxsize=None)
+def get_database() -> Database:
+    return get_mongo_client()[settings.mongo.database]
+
+
+def _forget_client_after_fork() -> None:
+    # Celery prefork children inherit the parent's sockets and monitor threads,
+    # which pymongo does not support; drop them (without closing the parent's
+    # connections) so the child lazily builds its own pool.
+    get_mongo_client.cache_clear()
+    get_database.cache_clear()
+
+
+os.register_at_fork(after_in_child=_forget_client_after_fork)
+
+
 class MongoRepositoryBase:
     """Base class that provides the Mongo client, database and helpers."""
 
     def __init__(self) -> None:
-        self.client = MongoClient(settings.mongo.uri, **settings.mongo.options)
-        self.db = self.client[settings.mongo.database]
         self.collections = settings.storage
 
+    @property
+    def client(self) -> MongoClient:
+        return get_mongo_client()
+
+    @property
+    def db(self) -> Database:
+        return get_database()
+
     @staticmethod
     def _serialize(doc: Dict[str, Any]) -> Dict[str, Any]:
+        """Rename ``_id`` to a string ``id`` in place.
+
+        Only ever called on documents freshly decoded by the driver, so there
+        is no caller-visible dict to protect with a copy.
+        """
         if not doc:
             return doc
-        doc = {**doc}
         if "_id" in doc:
             doc["id"] = str(doc.pop("_id"))
         return doc
+
+    @staticmethod
+    def _set_stamped(
+        fields: Dict[str, Any], now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Build a ``$set`` update that also stamps ``updated_at``.
+
+        Without an explicit ``now`` the server clock is used via ``$currentDate``.
+        """
+        if now is not None:
+            return {"$set": {**fields, "updated_at": now}}
+        update: Dict[str, Any] = {"$currentDate": {"updated_at": True}}
+        if fields:
+            update["$set"] = fields
+        return update
+
+    def _update_by_id(
+        self,
+        collection: str,
+        record_id: str,
+        update: Dict[str, Any],
+        return_doc: bool = True,
+    ) -> Optional[Dict[str, Any]]:
+        """Apply ``update`` to one document, fetching it back only if asked.
+
+        Without ``return_doc`` a plain ``update_one`` replaces ``findAndModify``,
+        which would ship the whole updated document back for nothing.
+        """
+        query = {"_id": object_id(record_id)}
+        if not return_doc:
+            self.db[collection].update_one(query, update)
+            return None
+        doc = self.db[collection].find_one_and_update(
+            query, update, return_document=ReturnDocument.AFTER
+        )
+        return self._serialize(doc) if doc else None
+
+    @staticmethod
+    def _filter_query(
+        filters: Optional[Dict[str, Any]], filterable: Collection[str]
+    ) -> Dict[str, Any]:
+        """Keep only clauses on known fields so list queries stay index-friendly."""
+        if not filters:
+            return {}
+        return {
+            key: value
+            for key, value in filters.items()
+            if key in filterable and value not in (None, "")
+        }
+
+    @staticmethod
+    def _encode_cursor(doc: Dict[str, Any], sort_field: str) -> str:
+        token = json_util.dumps(
+            {"f": sort_field, "v": doc.get(sort_field), "id": doc["_id"]}
+        )
+        return base64.urlsafe_b64encode(token.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def _keyset_clause(
+        after: str, sort_field: str, sort_direction: int
+    ) -> Dict[str, Any]:
+        """Translate an ``after`` cursor into a range filter past that row."""
+        try:
+            token = json_util.loads(base64.urlsafe_b64decode(after.encode("ascii")))
+            field, value, last_id = token["f"], token["v"], token["id"]
+        except (binascii.Error, KeyError, TypeError, ValueError) as exc:
+            raise InvalidCursorError("Invalid pagination cursor") from exc
+        if field != sort_field:
+            raise InvalidCursorError("Cursor was issued for a different sort")
+        op = "$lt" if sort_direction < 0 else "$gt"
+        # Null and missing values sort below everything else, but $gt/$lt only
+        # compare within one BSON type, so that edge is spelled out here.
+        if value is None:
+            clauses = [{sort_field: None, "_id": {op: last_id}}]
+            if sort_direction > 0:
+                clauses.append({sort_field: {"$ne": None}})
+        else:
+            clauses = [
+                {sort_field: {op: value}},
+                {sort_field: value, "_id": {op: last_id}},
+            ]
+            if sort_direction < 0:
+                clauses.append({sort_field: None})
+        return {"$or": clauses}
+
+    def _paginate(
+        self,
+        collection: MongoCollection,
+        query: Dict[str, Any],
+        *,
+        page: int,
+        page_size: int,
+        sort_field: str,
+        sort_direction: int,
+        after: Optional[str] = None,
+        projection: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Return one page plus the total and a cursor for the following page.
+
+        With ``after`` the page is found by a range on ``(sort_field, _id)``
+        instead of skipping ``(page - 1) * page_size`` documents.
+        """
+        # An unfiltered total comes from collection metadata, not an index walk.
+        total = (
+            collection.count_documents(query)
+            if query
+            else collection.estimated_document_count()
+        )
+        if after:
+            keyset = self._keyset_clause(after, sort_field, sort_direction)
+            query = {"$and": [query, keyset]} if query else keyset
+            skip = 0
+        else:
+            skip = (max(page, 1) - 1) * page_size
+        docs = list(
+            collection.find(query, projection)
+            .sort([(sort_field, sort_direction), ("_id", sort_direction)])
+            .skip(skip)
+            .limit(page_size)
+            # Fetch the whole page in the first batch (the default stops at 101).
+            .batch_size(page_size)
+        )
+        next_cursor = (
+            self._encode_cursor(docs[-1], sort_field)
+            if len(docs) == page_size
+            else None
+        )
+        return {
+            "items": [self._serialize(doc) for doc in docs],
+            "total": total,
+            "next_cursor": next_cursor,
+        }
@@ -1,19 +1,39 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
-from bson import ObjectId
-from pymongo import ReturnDocument
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument
 from app.models import ScanJobStatus
-from app.services.repository_base import MongoRepositoryBase
+from app.services.repository_base import MongoRepositoryBase, object_id
 
 _UNSET = object()
 
 
 class ScanJobsRepository(MongoRepositoryBase):
-    def create_scan_job(
-        self,
+    def ensure_indexes(self) -> None:
+        self.db[self.collections.scan_jobs_collection].create_indexes(
+            [
+                IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+                # Status-filtered pages (e.g. the failed-commits view).
+                IndexModel(
+                    [
+                        ("status", ASCENDING),
+                        ("created_at", DESCENDING),
+                        ("_id", DESCENDING),
+                    ]
+                ),
+                IndexModel([("project_id", ASCENDING), ("status", ASCENDING)]),
+                IndexModel([("project_key", ASCENDING), ("created_at", DESCENDING)]),
+                IndexModel([("component_key", ASCENDING)]),
+                # find_stalled_jobs: one branch per status, ranged on time.
+                IndexModel([("status", ASCENDING), ("updated_at", ASCENDING)]),
+                IndexModel([("status", ASCENDING), ("last_started_at", ASCENDING)]),
+            ]
+        )
+
+    @staticmethod
+    def _new_job_doc(
         *,
         project_id: str,
         commit_sha: str,
@@ -22,9 +42,10 @@ class ScanJobsRepository(MongoRepositoryBase):
         project_key: Optional[str] = None,
         max_retries: int = 5,
         status: str = "PENDING",
+        now: Optional[datetime] = None,
     ) -> Dict[str, Any]:
-        now = datetime.utcnow()
-        payload = {
+        now = now or datetime.utcnow()
+        doc = {
             "project_id": project_id,
             "commit_sha": commit_sha,
             "repository_url": repository_url,
@@ -46,19 +67,57 @@ class ScanJobsRepository(MongoRepositoryBase):
             "last_started_at": None,
             "last_finished_at": None,
         }
+        # Unset fields read back as None anyway (documents go through the
+        # ScanJob defaults), so storing explicit nulls only bloats every job.
+        return {key: value for key, value in doc.items() if value is not None}
+
+    def create_scan_job(
+        self,
+        *,
+        project_id: str,
+        commit_sha: str,
+        repository_url: Optional[str] = None,
+        repo_slug: Optional[str] = None,
+        project_key: Optional[str] = None,
+        max_retries: int = 5,
+        status: str = "PENDING",
+    ) -> Dict[str, Any]:
+        payload = self._new_job_doc(
+            project_id=project_id,
+            commit_sha=commit_sha,
+            repository_url=repository_url,
+            repo_slug=repo_slug,
+            project_key=project_key,
+            max_retries=max_retries,
+            status=status,
+        )
         result = self.db[self.collections.scan_jobs_collection].insert_one(payload)
         payload["id"] = str(result.inserted_id)
         return payload
 
+    def create_scan_jobs(self, jobs: Iterable[Dict[str, Any]]) -> List[str]:
+        """Insert many scan jobs in one unordered bulk write; returns their ids.
+
+        Each item takes the keyword arguments of ``create_scan_job``.
+        """
+        now = datetime.utcnow()
+        docs = [self._new_job_doc(**job, now=now) for job in jobs]
+        if not docs:
+            return []
+        result = self.db[self.collections.scan_jobs_collection].insert_many(
+            docs, ordered=False
+        )
+        return [str(inserted_id) for inserted_id in result.inserted_ids]
+
     def get_scan_job(self, job_id: str) -> Optional[Dict[str, Any]]:
         doc = self.db[self.collections.scan_jobs_collection].find_one(
-            {"_id": ObjectId(job_id)}
+            {"_id": object_id(job_id)}
         )
         return self._serialize(doc) if doc else None
 
     def claim_job(self, job_id: str, worker_id: str) -> Optional[Dict[str, Any]]:
         query: Dict[str, Any] = {
-            "_id": ObjectId(job_id),
+            "_id": object_id(job_id),
             "status": {
                 "$in": [ScanJobStatus.pending.value, ScanJobStatus.failed_temp.value]
             },
@@ -97,8 +156,10 @@ class ScanJobsRepository(MongoRepositoryBase):
         log_path: Any = _UNSET,
         config_override: Any = _UNSET,
         config_source: Any = _UNSET,
+        now: Optional[datetime] = None,
+        return_doc: bool = True,
     ) -> Optional[Dict[str, Any]]:
-        set_updates: Dict[str, Any] = {"updated_at": datetime.utcnow()}
+        set_updates: Dict[str, Any] = {}
         if status:
             set_updates["status"] = status
         if last_error is not _UNSET:
@@ -124,25 +185,41 @@ class ScanJobsRepository(MongoRepositoryBase):
         if config_source is not _UNSET:
             set_updates["config_source"] = config_source
 
-        update_doc: Dict[str, Any] = {"$set": set_updates}
+        update_doc = self._set_stamped(set_updates, now)
         if retry_count_delta:
             update_doc["$inc"] = {"retry_count": retry_count_delta}
         if retry_count is not None:
             update_doc.setdefault("$set", {})
             update_doc["$set"]["retry_count"] = retry_count
 
-        doc = self.db[self.collections.scan_jobs_collection].find_one_and_update(
-            {"_id": ObjectId(job_id)},
-            update_doc,
-            return_document=ReturnDocument.AFTER,
+        return self._update_by_id(
+            self.collections.scan_jobs_collection, job_id, update_doc, return_doc
         )
-        return self._serialize(doc) if doc else None
+
+    def bulk_update_scan_jobs(
+        self,
+        job_ids: List[str],
+        updates: Dict[str, Any],
+        now: Optional[datetime] = None,
+    ) -> int:
+        """Apply the same ``$set`` to many scan jobs in one round-trip."""
+        if not job_ids:
+            return 0
+        result = self.db[self.collections.scan_jobs_collection].update_many(
+            {"_id": {"$in": [object_id(job_id) for job_id in job_ids]}},
+            self._set_stamped(updates, now),
+        )
+        return result.modified_count
 
     def list_jobs_by_status(
-        self, project_id: str, statuses: List[str]
+        self,
+        project_id: str,
+        statuses: List[str],
+        fields: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
+        """List a project's jobs in ``statuses``; ``fields`` limits each document."""
         cursor = self.db[self.collections.scan_jobs_collection].find(
-            {"project_id": project_id, "status": {"$in": statuses}}
+            {"project_id": project_id, "status": {"$in": statuses}}, fields
         )
         return [self._serialize(doc) for doc in cursor]
 
@@ -152,6 +229,7 @@ class ScanJobsRepository(MongoRepositoryBase):
             .find()
             .sort("created_at", -1)
             .limit(limit)
+            .batch_size(limit)
         )
         return [self._serialize(doc) for doc in cursor]
 
@@ -162,27 +240,32 @@ class ScanJobsRepository(MongoRepositoryBase):
         sort_by: Optional[str] = None,
         sort_dir: str = "desc",
         filters: Optional[Dict[str, Any]] = None,
+        after: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Return paginated scan jobs and total count (page is 1-based)."""
-        if page < 1:
-            page = 1
-        skip = (page - 1) * page_size
         collection = self.db[self.collections.scan_jobs_collection]
-        query = filters or {}
+        filterable = {
+            "status",
+            "project_id",
+            "project_key",
+            "commit_sha",
+            "component_key",
+        }
+        query = self._filter_query(filters, filterable)
 
         allowed = {"created_at", "status", "project_id", "commit_sha"}
         sort_field = sort_by if sort_by in allowed else "created_at"
         sort_direction = -1 if sort_dir.lower() == "desc" else 1
 
-        total = collection.count_documents(query)
-        cursor = (
-            collection.find(query)
-            .sort(sort_field, sort_direction)
-            .skip(skip)
-            .limit(page_size)
+        return self._paginate(
+            collection,
+            query,
+            page=page,
+            page_size=page_size,
+            sort_field=sort_field,
+            sort_direction=sort_direction,
+            after=after,
         )
-        items = [self._serialize(doc) for doc in cursor]
-        return {"items": items, "total": total}
 
     def find_stalled_jobs(
         self,
@@ -215,6 +298,7 @@ class ScanJobsRepository(MongoRepositoryBase):
             .find(query)
             .sort("updated_at", 1)
             .limit(limit)
+            .batch_size(limit)
         )
         return [self._serialize(doc) for doc in cursor]
 
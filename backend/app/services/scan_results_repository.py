@@ -1,15 +1,31 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
-from pymongo import ReturnDocument
-from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument
 
-from app.services.repository_base import MongoRepositoryBase
+from app.services.repository_base import MongoRepositoryBase, object_id
 
 
 class ScanResultsRepository(MongoRepositoryBase):
+    def ensure_indexes(self) -> None:
+        self.db[self.collections.scan_results_collection].create_indexes(
+            [
+                IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+                IndexModel([("job_id", ASCENDING)]),
+                # Project-filtered pages and exports, including the _id tiebreak.
+                IndexModel(
+                    [
+                        ("project_id", ASCENDING),
+                        ("created_at", ASCENDING),
+                        ("_id", ASCENDING),
+                    ]
+                ),
+                IndexModel([("sonar_project_key", ASCENDING), ("_id", ASCENDING)]),
+            ]
+        )
+
     def upsert_result(
         self,
         *,
@@ -17,20 +33,26 @@ class ScanResultsRepository(MongoRepositoryBase):
         job_id: str,
         sonar_project_key: str,
         metrics: Dict[str, Any],
-    ) -> Dict[str, Any]:
+        return_doc: bool = True,
+    ) -> Optional[Dict[str, Any]]:
         now = datetime.utcnow()
         collection = self.db[self.collections.scan_results_collection]
+        update = {
+            "$set": {
+                "project_id": project_id,
+                "sonar_project_key": sonar_project_key,
+                "metrics": metrics,
+                "updated_at": now,
+            },
+            "$setOnInsert": {"created_at": now},
+        }
+        if not return_doc:
+            # Skip shipping the post-image (the whole metrics map) back.
+            collection.update_one({"job_id": job_id}, update, upsert=True)
+            return None
         doc = collection.find_one_and_update(
             {"job_id": job_id},
-            {
-                "$set": {
-                    "project_id": project_id,
-                    "sonar_project_key": sonar_project_key,
-                    "metrics": metrics,
-                    "updated_at": now,
-                },
-                "$setOnInsert": {"created_at": now},
-            },
+            update,
             upsert=True,
             return_document=ReturnDocument.AFTER,
         )
@@ -42,6 +64,7 @@ class ScanResultsRepository(MongoRepositoryBase):
             .find()
             .sort("created_at", -1)
             .limit(limit)
+            .batch_size(limit)
         )
         return [self._serialize(doc) for doc in cursor]
 
@@ -52,26 +75,25 @@ class ScanResultsRepository(MongoRepositoryBase):
         sort_by: Optional[str] = None,
         sort_dir: str = "desc",
         filters: Optional[Dict[str, Any]] = None,
+        after: Optional[str] = None,
     ) -> Dict[str, Any]:
-        if page < 1:
-            page = 1
-        skip = (page - 1) * page_size
         collection = self.db[self.collections.scan_results_collection]
-        query = filters or {}
+        filterable = {"project_id", "job_id", "sonar_project_key"}
+        query = self._filter_query(filters, filterable)
 
         allowed = {"created_at", "sonar_project_key"}
         sort_field = sort_by if sort_by in allowed else "created_at"
         sort_direction = -1 if sort_dir.lower() == "desc" else 1
 
-        total = collection.count_documents(query)
-        cursor = (
-            collection.find(query)
-            .sort(sort_field, sort_direction)
-            .skip(skip)
-            .limit(page_size)
+        return self._paginate(
+            collection,
+            query,
+            page=page,
+            page_size=page_size,
+            sort_field=sort_field,
+            sort_direction=sort_direction,
+            after=after,
         )
-        items = [self._serialize(doc) for doc in cursor]
-        return {"items": items, "total": total}
 
     def get_by_job_id(self, job_id: str) -> Optional[Dict[str, Any]]:
         doc = self.db[self.collections.scan_results_collection].find_one(
@@ -81,14 +103,48 @@ class ScanResultsRepository(MongoRepositoryBase):
 
     def get_result(self, result_id: str) -> Optional[Dict[str, Any]]:
         doc = self.db[self.collections.scan_results_collection].find_one(
-            {"_id": ObjectId(result_id)}
+            {"_id": object_id(result_id)}
         )
         return self._serialize(doc) if doc else None
 
     def list_by_project(self, project_id: str) -> List[Dict[str, Any]]:
+        return list(self.iter_by_project(project_id))
+
+    def iter_by_project(
+        self,
+        project_id: str,
+        batch_size: int = 1000,
+        fields: Optional[List[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield a project's results in creation order without loading them all.
+
+        ``fields`` limits each document to those paths (``_id`` is dropped).
+        """
+        projection = dict.fromkeys(fields, 1) | {"_id": 0} if fields else None
         cursor = (
             self.db[self.collections.scan_results_collection]
-            .find({"project_id": project_id})
+            .find({"project_id": project_id}, projection)
             .sort("created_at", 1)
+            .batch_size(batch_size)
         )
-        return [self._serialize(doc) for doc in cursor]
+        with cursor:
+            for doc in cursor:
+                yield self._serialize(doc)
+
+    def metric_keys_by_project(self, project_id: str) -> Optional[List[str]]:
+        """Return the sorted metric names across a project's results.
+
+        ``None`` means the project has no results at all.
+        """
+        pipeline = [
+            {"$match": {"project_id": project_id}},
+            {"$project": {"k": {"$objectToArray": {"$ifNull": ["$metrics", {}]}}}},
+            {"$unwind": {"path": "$k", "preserveNullAndEmptyArrays": True}},
+            {"$group": {"_id": "$k.k"}},
+        ]
+        groups = list(
+            self.db[self.collections.scan_results_collection].aggregate(pipeline)
+        )
+        if not groups:
+            return None
+        return sorted(group["_id"] for group in groups if group["_id"] is not None)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from pathlib import Path
 
 import pandas as pd
+from celery import group
 from celery.utils.log import get_task_logger
 
 from app.celery_app import celery_app
@@ -15,6 +17,9 @@ from app.tasks.sonar import run_scan_job
 
 logger = get_task_logger(__name__)
 
+# The only CSV columns ingestion reads; any of them may be absent.
+_CSV_COLUMNS = ["git_trigger_commit", "gh_project_name", "repository_url"]
+
 
 @celery_app.task(bind=True)
 def ingest_project(self, project_id: str) -> dict:
@@ -35,47 +40,72 @@ def ingest_project(self, project_id: str) -> dict:
         status=ProjectStatus.processing.value,
         total_builds=summary.get("total_builds", 0),
         total_commits=summary.get("total_commits", 0),
+        return_doc=False,
     )
 
-    default_project_key = Path(csv_path).stem
-    df = pd.read_csv(csv_path, encoding=settings.pipeline.csv_encoding, dtype=str)
-    df = df.fillna("")
-
-    df["commit"] = df.get("git_trigger_commit", "").astype(str).str.strip()
-    df["repo_slug"] = df.get("gh_project_name", "").astype(str).str.strip()
-
-    def _derive_key(slug: str) -> str:
-        return slug.replace("/", "_") if slug else default_project_key
-
-    df["project_key"] = df["repo_slug"].apply(_derive_key)
-    df = df[df["commit"] != ""]
-    df_unique = df.drop_duplicates(subset=["project_key", "commit"], keep="first")
-
-    total_commits = int(len(df_unique))
-    if total_commits == 0:
-        repository.update_project(project_id, status=ProjectStatus.finished.value)
-        return {"project_id": project_id, "queued": 0}
+    default_project_key = csv_path.stem
+    max_retries = project.get("max_retries", settings.pipeline.default_retry_limit)
 
+    # Stream the CSV so memory tracks the chunk size plus the dedup keys rather
+    # than the whole file; each chunk becomes one bulk insert and one group.
+    chunks = pd.read_csv(
+        csv_path,
+        encoding=settings.pipeline.csv_encoding,
+        dtype=str,
+        # Empty fields come back as "" instead of being scanned for NA markers.
+        na_filter=False,
+        usecols=lambda column: column in _CSV_COLUMNS,
+        chunksize=settings.pipeline.ingestion_chunk_size,
+    )
+    # Commits seen per project key: no tuple or repeated key string per row.
+    seen: defaultdict[str, set[str]] = defaultdict(set)
+    clone_urls: dict[tuple[str, str], str] = {}
     queued = 0
-    max_retries = project.get("max_retries", settings.pipeline.default_retry_limit)
+    for chunk in chunks:
+        chunk = chunk.reindex(columns=_CSV_COLUMNS, fill_value="")
+        commits = chunk["git_trigger_commit"].str.strip()
+        slugs = chunk["gh_project_name"].str.strip()
+        keys = slugs.str.replace("/", "_", regex=False).where(
+            slugs != "", default_project_key
+        )
 
-    for _, row in df_unique.iterrows():
-        project_key = row["project_key"]
-        commit = row["commit"]
-        repo_slug = row["repo_slug"] or None
-        repo_url = row.get("repository_url") or None
-        repo_url = normalize_repo_url(repo_url, repo_slug)
-
-        job_doc = repository.create_scan_job(
-            project_id=project_id,
-            commit_sha=commit,
-            repository_url=repo_url,
-            repo_slug=repo_slug,
-            project_key=project_key,
-            max_retries=max_retries,
+        jobs = []
+        for commit, repo_slug, project_key, repo_url in zip(
+            commits, slugs, keys, chunk["repository_url"]
+        ):
+            if not commit:
+                continue
+            project_commits = seen[project_key]
+            if commit in project_commits:
+                continue
+            project_commits.add(commit)
+            # Rows of one repository share a clone URL; normalise it once.
+            clone_url = clone_urls.get((repo_url, repo_slug))
+            if clone_url is None:
+                clone_url = normalize_repo_url(repo_url or None, repo_slug or None)
+                clone_urls[(repo_url, repo_slug)] = clone_url
+            jobs.append(
+                {
+                    "project_id": project_id,
+                    "commit_sha": commit,
+                    "repository_url": clone_url,
+                    "repo_slug": repo_slug or None,
+                    "project_key": project_key,
+                    "max_retries": max_retries,
+                }
+            )
+
+        job_ids = repository.create_scan_jobs(jobs)
+        if job_ids:
+            # Dispatch per chunk so workers start while later chunks insert.
+            group(run_scan_job.s(job_id) for job_id in job_ids).apply_async()
+            queued += len(job_ids)
+
+    if not queued:
+        repository.update_project(
+            project_id, status=ProjectStatus.finished.value, return_doc=False
         )
-        run_scan_job.delay(job_doc["id"])
-        queued += 1
+        return {"project_id": project_id, "queued": 0}
 
     logger.info("Queued %d scan jobs for project %s", queued, project_id)
     return {"project_id": project_id, "queued": queued}
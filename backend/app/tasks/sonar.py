@@ -4,18 +4,29 @@ from datetime import datetime, timedelta
 from typing import Any, Dict, Optional
 import time
 
+from celery import group
 from celery.utils.log import get_task_logger
 
 from app.celery_app import celery_app
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.models import ProjectStatus, ScanJobStatus
 from app.services import repository
 from pipeline.commit_replay import MissingForkCommitError
 from pipeline.github_api import GitHubRateLimitError
-from pipeline.sonar import MetricsExporter, get_runner_for_instance, normalize_repo_url
+from pipeline.sonar import (
+    get_exporter_for_instance,
+    get_runner_for_instance,
+    normalize_repo_url,
+)
 
 logger = get_task_logger(__name__)
 
+# Exports of every commit re-check the same project. Only fields that never
+# change after creation are cached; sonar_config can be replaced at any time
+# (from the API process, which cannot clear this cache), so scans read it fresh.
+_PROJECT_CACHE = TTLCache(ttl=5.0, maxsize=1024)
+
 
 class PermanentScanError(Exception):
     """Raised when a scan failure should not be retried."""
@@ -28,8 +39,26 @@ def _safe_int(value: Optional[str | int]) -> int:
         return 0
 
 
-def _check_project_completion(project_id: str) -> None:
-    project = repository.get_project(project_id)
+def _get_project(project_id: str) -> Optional[Dict[str, Any]]:
+    """Return the project's immutable ``id`` and ``project_key``, cached."""
+    project = _PROJECT_CACHE.get(project_id)
+    if project is None:
+        project = repository.get_project(project_id, fields=["project_key"])
+        if project:
+            _PROJECT_CACHE.set(project_id, project)
+    return project
+
+
+def _check_project_completion(
+    project_id: str, project: Optional[Dict[str, Any]] = None
+) -> None:
+    """Mark the project finished once every commit is processed or failed.
+
+    Callers that just updated the project can pass the returned document to
+    skip re-reading it.
+    """
+    if project is None:
+        project = repository.get_project(project_id)
     if not project:
         return
     total_commits = _safe_int(project.get("total_commits"))
@@ -39,7 +68,9 @@ def _check_project_completion(project_id: str) -> None:
         project.get("failed_commits") or 0
     )
     if completed >= total_commits:
-        repository.update_project(project_id, status=ProjectStatus.finished.value)
+        repository.update_project(
+            project_id, status=ProjectStatus.finished.value, return_doc=False
+        )
 
 
 def _record_failed_commit(
@@ -48,7 +79,8 @@ def _record_failed_commit(
     *,
     reason: str,
     error: str,
-) -> None:
+) -> Optional[Dict[str, Any]]:
+    """Persist the failed commit; returns the project if its counter was bumped."""
     project_id = (project or {}).get("id") or job.get("project_id")
     project_key = (project or {}).get("project_key") or job.get("project_key")
     payload = {
@@ -60,7 +92,7 @@ def _record_failed_commit(
         "repo_slug": job.get("repo_slug"),
         "error": error,
     }
-    existing = repository.get_failed_commit_by_job(job["id"])
+    existing = repository.get_failed_commit_by_job(job["id"], fields=["counted"])
     already_counted = (existing or {}).get("counted", True)
     should_increment = bool(project) and (existing is None or not already_counted)
 
@@ -70,6 +102,7 @@ def _record_failed_commit(
             payload=payload,
             status="pending",
             counted=True,
+            return_doc=False,
         )
     else:
         repository.insert_failed_commit(
@@ -78,7 +111,8 @@ def _record_failed_commit(
         )
 
     if should_increment and project:
-        repository.update_project(project["id"], failed_delta=1)
+        return repository.update_project(project["id"], failed_delta=1)
+    return None
 
 
 def _handle_scan_failure(
@@ -104,19 +138,27 @@ def _handle_scan_failure(
         last_error=message,
         retry_count_delta=1,
         last_finished_at=now,
+        now=now,
     )
     retry_count = (updated or job).get("retry_count", 0)
     max_retries = job.get("max_retries") or settings.pipeline.default_retry_limit
 
     if permanent or retry_count >= max_retries:
-        repository.update_scan_job(
-            job["id"],
-            status=ScanJobStatus.failed_permanent.value,
-            last_error=message,
-            last_finished_at=now,
+        if not permanent:
+            # Permanent failures already wrote this status above; only
+            # exhausted retries need to be promoted from FAILED_TEMP.
+            repository.update_scan_job(
+                job["id"],
+                status=ScanJobStatus.failed_permanent.value,
+                last_error=message,
+                last_finished_at=now,
+                now=now,
+                return_doc=False,
+            )
+        updated_project = _record_failed_commit(
+            job, project, reason=failure_reason, error=message
         )
-        _record_failed_commit(job, project, reason=failure_reason, error=message)
-        _check_project_completion(project["id"])
+        _check_project_completion(project["id"], updated_project)
         logger.error(
             "Scan job %s failed permanently after %s attempts: %s",
             job["id"],
@@ -159,13 +201,16 @@ def run_scan_job(self, scan_job_id: str) -> str:
         return job["id"]
     job = claimed
 
-    project = repository.get_project(job["project_id"])
+    project = repository.get_project(
+        job["project_id"], fields=["project_key", "sonar_config"]
+    )
     if not project:
         repository.update_scan_job(
             job["id"],
             status=ScanJobStatus.failed_permanent.value,
             last_error="Project not found",
             last_finished_at=datetime.utcnow(),
+            return_doc=False,
         )
         _record_failed_commit(
             job,
@@ -180,8 +225,7 @@ def run_scan_job(self, scan_job_id: str) -> str:
     project_key = job.get("project_key") or project.get("project_key")
     runner = get_runner_for_instance(project_key)
     repository.update_scan_job(
-        job["id"],
-        sonar_instance=runner.instance.name,
+        job["id"], sonar_instance=runner.instance.name, return_doc=False
     )
 
     override_text = job.get("config_override")
@@ -227,6 +271,7 @@ def run_scan_job(self, scan_job_id: str) -> str:
         last_error=None,
         last_finished_at=datetime.utcnow(),
         s3_log_key=result.s3_log_key,
+        return_doc=False,
     )
 
     return result.component_key
@@ -245,12 +290,10 @@ def export_metrics(
     job = repository.get_scan_job(job_id)
     if not job:
         raise ValueError(f"Scan job {job_id} not found for export")
-    project = repository.get_project(project_id)
-    if not project:
+    if not _get_project(project_id):
         raise ValueError(f"Project {project_id} missing for export")
 
-    instance = settings.sonarqube.get_instance(job.get("sonar_instance"))
-    exporter = MetricsExporter.from_instance(instance)
+    exporter = get_exporter_for_instance(job.get("sonar_instance"))
     metrics = exporter.collect_metrics(component_key)
     if not metrics:
         raise RuntimeError(f"No metrics available for {component_key}")
@@ -260,26 +303,27 @@ def export_metrics(
         job_id=job_id,
         sonar_project_key=component_key,
         metrics=metrics,
+        return_doc=False,
     )
 
+    finished_at = datetime.utcnow()
     repository.update_scan_job(
         job_id,
         status=ScanJobStatus.success.value,
         last_error=None,
-        last_finished_at=datetime.utcnow(),
+        last_finished_at=finished_at,
+        now=finished_at,
+        return_doc=False,
     )
-    failed_record = repository.get_failed_commit_by_job(job_id)
-    update_kwargs: Dict[str, Any] = {"processed_delta": 1}
-    if failed_record and failed_record.get("counted", True):
-        repository.update_failed_commit(
-            failed_record["id"],
-            status="resolved",
-            resolved_at=datetime.utcnow(),
-            counted=False,
-        )
+    update_kwargs: Dict[str, Any] = {
+        "processed_delta": 1,
+        "metric_keys": metrics.keys(),
+        "now": finished_at,
+    }
+    if repository.resolve_failed_commit_by_job(job_id, finished_at):
         update_kwargs["failed_delta"] = -1
-    repository.update_project(project_id, **update_kwargs)
-    _check_project_completion(project_id)
+    updated_project = repository.update_project(project_id, **update_kwargs)
+    _check_project_completion(project_id, updated_project)
     logger.info(
         "Stored metrics for component %s (job=%s, project=%s)",
         component_key,
@@ -297,15 +341,14 @@ def reconcile_scan_jobs() -> dict:
         pending_before=now - timedelta(minutes=30),
         limit=200,
     )
-    requeued = 0
-    for job in stalled:
-        repository.update_scan_job(
-            job["id"],
-            status=ScanJobStatus.pending.value,
-            last_worker_id=None,
-        )
-        run_scan_job.delay(job["id"])
-        requeued += 1
+    job_ids = [job["id"] for job in stalled]
+    repository.bulk_update_scan_jobs(
+        job_ids,
+        {"status": ScanJobStatus.pending.value, "last_worker_id": None},
+    )
+    if job_ids:
+        group(run_scan_job.s(job_id) for job_id in job_ids).apply_async()
+    requeued = len(job_ids)
     if requeued:
         logger.info("Requeued %d stalled scan jobs", requeued)
     return {"requeued": requeued}
@@ -7,10 +7,13 @@ from typing import List, Optional
 from urllib.parse import quote
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from app.core.config import settings
 
 LOG = logging.getLogger("pipeline.github")
+# Keep-alive connections held per host so concurrent callers reuse TLS sessions.
+_POOL_MAXSIZE = 32
 
 
 class AllTokensRateLimited(RuntimeError):
@@ -84,6 +87,9 @@ class GitHubAPI:
         self.base_url = base_url.rstrip("/")
         self.token_pool = GitHubTokenPool(tokens)
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=_POOL_MAXSIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.headers.update({
             "User-Agent": "build-commit-pipeline/sonar",
         })
@@ -161,23 +167,30 @@ class GitHubAPI:
 
 
 _CLIENT: Optional[GitHubAPI] = None
+_CLIENT_RESOLVED = False
+_CLIENT_LOCK = threading.Lock()
 
 
 def get_github_client() -> Optional[GitHubAPI]:
     """Return a cached GitHub client instance, if tokens are configured."""
 
-    global _CLIENT
-    if _CLIENT is not None:
+    global _CLIENT, _CLIENT_RESOLVED
+    if _CLIENT_RESOLVED:
         return _CLIENT
-    tokens = settings.github.tokens if hasattr(settings, "github") else []
-    cleaned = [token for token in tokens if token]
-    if not cleaned:
-        LOG.warning(
-            "GitHub token pool is empty; missing-fork commits cannot be replayed until tokens are configured."
-        )
-        return None
-    _CLIENT = GitHubAPI(
-        base_url=getattr(settings.github, "api_url", "https://api.github.com"),
-        tokens=cleaned,
-    )
+    with _CLIENT_LOCK:
+        # Threads racing on first use must share one session and token pool.
+        # An empty pool is cached too, so the settings are only resolved once.
+        if not _CLIENT_RESOLVED:
+            tokens = settings.github.tokens if hasattr(settings, "github") else []
+            cleaned = [token for token in tokens if token]
+            if cleaned:
+                _CLIENT = GitHubAPI(
+                    base_url=getattr(settings.github, "api_url", "https://api.github.com"),
+                    tokens=cleaned,
+                )
+            else:
+                LOG.warning(
+                    "GitHub token pool is empty; missing-fork commits cannot be replayed until tokens are configured."
+                )
+            _CLIENT_RESOLVED = True
     return _CLIENT
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 import csv
+import mmap
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
+from hashlib import sha256
 from pathlib import Path
 from typing import Dict, Iterable, Iterator, List, Optional, Set
 
@@ -10,6 +14,10 @@ from app.core.config import settings
 REPO_COLUMN = "gh_project_name"
 COMMIT_COLUMN = "git_trigger_commit"
 
+_SUMMARY_CACHE_SIZE = 64
+_SUMMARY_CACHE: "OrderedDict[str, Dict[str, Optional[str] | int]]" = OrderedDict()
+_SUMMARY_LOCK = threading.Lock()
+
 
 @dataclass
 class CommitWorkItem:
@@ -43,6 +51,24 @@ class CSVIngestionPipeline:
             for row in reader:
                 yield row
 
+    def _load_columns(self, *columns: str) -> Iterator[tuple[Optional[str], ...]]:
+        """Yield only the requested columns per row, skipping per-row dict building."""
+        with self.csv_path.open("r", encoding=self.encoding, newline="") as handle:
+            reader = csv.reader(handle)
+            header = next(reader, None)
+            if not header:
+                raise ValueError("CSV missing header row.")
+            positions = {name: idx for idx, name in enumerate(header)}
+            indices = [positions.get(column) for column in columns]
+            for row in reader:
+                if not row:
+                    continue
+                width = len(row)
+                yield tuple(
+                    row[idx] if idx is not None and idx < width else None
+                    for idx in indices
+                )
+
     @staticmethod
     def _clean(value: Optional[str]) -> Optional[str]:
         if value is None:
@@ -63,15 +89,15 @@ class CSVIngestionPipeline:
         repos: set[str] = set()
         project_name: Optional[str] = None
 
-        for row in self._load_rows():
+        for raw_commit, raw_slug in self._load_columns(COMMIT_COLUMN, REPO_COLUMN):
             total_builds += 1
-            commit = self._clean(row.get(COMMIT_COLUMN))
+            commit = self._clean(raw_commit)
             if commit and commit not in seen_commits:
                 seen_commits.add(commit)
                 if first_commit is None:
                     first_commit = commit
                 last_commit = commit
-            slug = self._clean(row.get(REPO_COLUMN))
+            slug = self._clean(raw_slug)
             if slug:
                 repos.add(slug)
                 project_name = project_name or slug
@@ -87,13 +113,45 @@ class CSVIngestionPipeline:
             "last_commit": last_commit,
         }
 
+    def content_digest(self) -> str:
+        """Return the SHA-256 of the CSV contents, hashed in one pass over an mmap."""
+        with self.csv_path.open("rb") as handle:
+            if self.csv_path.stat().st_size == 0:
+                return sha256().hexdigest()
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                return sha256(view).hexdigest()
+
+    def summarise_cached(
+        self, digest: Optional[str] = None
+    ) -> Dict[str, Optional[str] | int]:
+        """Summarise the CSV, reusing stats from earlier uploads of identical content.
+
+        Pass ``digest`` when the SHA-256 is already known (e.g. computed while
+        the upload was streamed to disk) to skip re-reading the file for it.
+        """
+        digest = digest or self.content_digest()
+        with _SUMMARY_LOCK:
+            cached = _SUMMARY_CACHE.get(digest)
+            if cached is not None:
+                _SUMMARY_CACHE.move_to_end(digest)
+        if cached is None:
+            cached = self.summarise()
+            with _SUMMARY_LOCK:
+                _SUMMARY_CACHE[digest] = cached
+                while len(_SUMMARY_CACHE) > _SUMMARY_CACHE_SIZE:
+                    _SUMMARY_CACHE.popitem(last=False)
+        stats = dict(cached)
+        # The fallback key is derived from the filename, so never reuse it across files.
+        stats["project_key"] = self._derive_project_key(stats.get("project_name"))
+        return stats
+
     def iter_commit_chunks(self, chunk_size: int) -> Iterable[List[CommitWorkItem]]:
         chunk: List[CommitWorkItem] = []
-        for row in self._load_rows():
-            commit = self._clean(row.get(COMMIT_COLUMN))
+        for raw_commit, raw_slug in self._load_columns(COMMIT_COLUMN, REPO_COLUMN):
+            commit = self._clean(raw_commit)
             if not commit:
                 continue
-            repo_slug = self._clean(row.get(REPO_COLUMN))
+            repo_slug = self._clean(raw_slug)
             repo_url = None
             if not repo_url and repo_slug:
                 repo_url = f"https://github.com/{repo_slug}.git"
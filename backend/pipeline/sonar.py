@@ -27,6 +27,7 @@ from pipeline.github_api import get_github_client
 
 LOG = logging.getLogger("pipeline.sonar")
 _RUNNER_CACHE: Dict[tuple[str, str], "SonarCommitRunner"] = {}
+_EXPORTER_CACHE: Dict[str, "MetricsExporter"] = {}
 
 
 @dataclass
@@ -109,11 +110,16 @@ class SonarCommitRunner:
             finally:
                 fcntl.flock(handle, fcntl.LOCK_UN)
 
-    def refresh_repo(self, repo_url: str) -> Path:
+    def set_origin(self, repo_url: str) -> Path:
+        """Clone if needed and point origin at ``repo_url``, which may have changed."""
         repo = self.ensure_repo(repo_url)
         run_command(
             ["git", "remote", "set-url", "origin", repo_url], cwd=repo, allow_fail=True
         )
+        return repo
+
+    def refresh_repo(self, repo_url: str) -> Path:
+        repo = self.set_origin(repo_url)
         # Fetch all refs including pull requests which may contain fork commits
         run_command(
             ["git", "fetch", "origin", "+refs/pull/*/head:refs/remotes/origin/pr/*"],
@@ -335,9 +341,13 @@ class SonarCommitRunner:
         s3_log_key: Optional[str] = None
         try:
             with self.repo_mutex():
-                self.refresh_repo(repo_url)
-                repo = self.repo_dir
+                repo = self.set_origin(repo_url)
+                # Commits of one repository share this clone; once an earlier
+                # scan's fetch brought the commit in, skip re-fetching every ref.
                 commit_present = self._commit_exists(repo, commit_sha)
+                if not commit_present:
+                    self.refresh_repo(repo_url)
+                    commit_present = self._commit_exists(repo, commit_sha)
                 if not commit_present:
                     LOG.warning(
                         "Commit %s not found after initial fetch, trying alternate strategies",
@@ -528,6 +538,7 @@ __all__ = [
     "CommitScanResult",
     "normalize_repo_url",
     "get_runner_for_instance",
+    "get_exporter_for_instance",
 ]
 
 
@@ -539,3 +550,11 @@ def get_runner_for_instance(
     if cache_key not in _RUNNER_CACHE:
         _RUNNER_CACHE[cache_key] = SonarCommitRunner(project_key, instance=instance)
     return _RUNNER_CACHE[cache_key]
+
+
+def get_exporter_for_instance(instance_name: Optional[str] = None) -> MetricsExporter:
+    """Return the worker's exporter for an instance, reusing its HTTP session."""
+    instance = settings.sonarqube.get_instance(instance_name)
+    if instance.name not in _EXPORTER_CACHE:
+        _EXPORTER_CACHE[instance.name] = MetricsExporter.from_instance(instance)
+    return _EXPORTER_CACHE[instance.name]
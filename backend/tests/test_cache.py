@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import unittest
+
+from app.core.cache import TTLCache
+
+
+class TTLCacheGenerationTests(unittest.TestCase):
+    def test_set_skips_values_read_before_an_invalidation(self):
+        cache = TTLCache(ttl=60.0)
+        generation = cache.generation()
+        cache.pop("p1")
+        cache.set("p1", "stale", generation)
+        self.assertIsNone(cache.get("p1"))
+
+    def test_set_stores_when_nothing_was_invalidated(self):
+        cache = TTLCache(ttl=60.0)
+        generation = cache.generation()
+        cache.set("p1", "fresh", generation)
+        self.assertEqual(cache.get("p1"), "fresh")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import os
+import unittest
+from pathlib import Path
+from unittest import mock
+
+os.environ.setdefault(
+    "PIPELINE_CONFIG",
+    str(Path(__file__).resolve().parents[2] / "config" / "pipeline.example.yml"),
+)
+
+import mongomock  # noqa: E402
+
+from app.services.failed_commits_repository import (  # noqa: E402
+    FailedCommitsRepository,
+)
+
+
+class BulkUpdateByJobIdsTests(unittest.TestCase):
+    def setUp(self):
+        db = mongomock.MongoClient().db
+        patcher = mock.patch(
+            "app.services.repository_base.get_database", return_value=db
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.repo = FailedCommitsRepository()
+
+    def _insert(self, job_id):
+        return self.repo.insert_failed_commit({"job_id": job_id}, reason="scan-failed")
+
+    def test_only_the_record_get_failed_commit_by_job_returns_is_reset(self):
+        first, second = self._insert("j1"), self._insert("j1")
+        other = self._insert("j2")
+
+        updated = self.repo.bulk_update_by_job_ids(
+            ["j1", "j2"], status="queued", counted=False
+        )
+
+        self.assertEqual(updated, 2)
+        statuses = {
+            record_id: self.repo.get_failed_commit(record_id)["status"]
+            for record_id in (first["id"], second["id"], other["id"])
+        }
+        self.assertEqual(statuses[first["id"]], "queued")
+        self.assertEqual(statuses[other["id"]], "queued")
+        self.assertEqual(statuses[second["id"]], "pending")
+        self.assertEqual(self.repo.get_failed_commit_by_job("j1")["id"], first["id"])
+
+
+if __name__ == "__main__":
+    unittest.main()
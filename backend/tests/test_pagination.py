@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import os
+import unittest
+from pathlib import Path
+
+os.environ.setdefault(
+    "PIPELINE_CONFIG",
+    str(Path(__file__).resolve().parents[2] / "config" / "pipeline.example.yml"),
+)
+
+import mongomock  # noqa: E402
+from bson import ObjectId  # noqa: E402
+
+from app.services.repository_base import MongoRepositoryBase  # noqa: E402
+
+
+class KeysetClauseTests(unittest.TestCase):
+    def _clause(self, value, direction):
+        doc = {"_id": ObjectId(), "project_name": value}
+        cursor = MongoRepositoryBase._encode_cursor(doc, "project_name")
+        return MongoRepositoryBase._keyset_clause(cursor, "project_name", direction)
+
+    def test_null_cursor_ascending_continues_into_non_null_values(self):
+        clauses = self._clause(None, 1)["$or"]
+        self.assertIn({"project_name": {"$ne": None}}, clauses)
+
+    def test_descending_cursor_keeps_null_rows_after_values(self):
+        clauses = self._clause("b", -1)["$or"]
+        self.assertIn({"project_name": None}, clauses)
+
+
+class KeysetPaginationTests(unittest.TestCase):
+    def setUp(self):
+        self.repo = MongoRepositoryBase()
+        self.collection = mongomock.MongoClient().db.projects
+        self.collection.insert_many(
+            [{"project_name": name} for name in ("a", "b", "c")]
+            + [{"project_name": None}, {}, {}]
+        )
+
+    def _walk(self, direction):
+        seen, after = [], None
+        while True:
+            page = self.repo._paginate(
+                self.collection,
+                {},
+                page=1,
+                page_size=2,
+                sort_field="project_name",
+                sort_direction=direction,
+                after=after,
+            )
+            seen.extend(item["id"] for item in page["items"])
+            after = page["next_cursor"]
+            if not after:
+                return seen
+
+    def test_pages_cover_rows_with_missing_sort_values(self):
+        expected = sorted(str(doc["_id"]) for doc in self.collection.find())
+        for direction in (1, -1):
+            with self.subTest(direction=direction):
+                seen = self._walk(direction)
+                self.assertEqual(len(seen), len(set(seen)))
+                self.assertEqual(sorted(seen), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()